@@ -28,7 +28,7 @@ import re
 import uuid
 from dataclasses import dataclass
 from pathlib import PurePosixPath
-from typing import Iterable, Iterator, List, Set, Tuple, FrozenSet, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, FrozenSet, Optional
 
 import click
 
@@ -39,6 +39,9 @@ from wildland.log import get_logger
 
 logger = get_logger('categorization-proxy')
 
+#: an underscore joining two categories, followed by any underscores belonging to the next one
+_CATEGORY_SEPARATOR_RE = re.compile(r'_(_*)')
+
 
 @dataclass(eq=True, frozen=True)
 class CategorizationSubcontainerMetaInfo:
@@ -46,7 +49,10 @@ class CategorizationSubcontainerMetaInfo:
     Categorization subcontainer metadata. Every unique instance of this class corresponds to a
     single subcontainer's manifest.
     """
-    dir_path: PurePosixPath
+    __slots__ = ('dir_path', 'title', 'categories')
+
+    #: path of the directory in the inner storage, as a string (see ``str(PurePosixPath)``)
+    dir_path: str
     title: str
     categories: FrozenSet[str]
 
@@ -92,6 +98,8 @@ class CategorizationProxyStorageBackend(StorageBackend):
         self.unclassified_category_path = self.params.get('unclassified-category-path',
                                                           '/unclassified')
         self.read_only = True
+        #: directory name -> result of _get_category_info(), valid during a single tree scan
+        self._category_info_cache: Dict[str, Tuple[str, str]] = {}
 
     @classmethod
     def cli_options(cls):
@@ -150,12 +158,12 @@ class CategorizationProxyStorageBackend(StorageBackend):
     ) -> Iterable[Tuple[PurePosixPath, Optional[ContainerStub]]]:
         ns = uuid.UUID(self.backend_id)
         dir_path = PurePosixPath('')
-        subcontainer_metainfo_set = self._get_categories_to_subcontainer_map(dir_path)
+        subcontainer_metainfo_map = self._get_categories_to_subcontainer_map(dir_path)
 
-        logger.debug('Collected subcontainers: %r', subcontainer_metainfo_set)
+        logger.debug('Collected subcontainers: %r', subcontainer_metainfo_map)
 
-        for subcontainer_metainfo in subcontainer_metainfo_set:
-            dirpath = str(subcontainer_metainfo.dir_path)
+        for subcontainer_metainfo in subcontainer_metainfo_map.values():
+            dirpath = subcontainer_metainfo.dir_path
             title = subcontainer_metainfo.title
             categories = list(subcontainer_metainfo.categories)
             ident = str(uuid.uuid3(ns, dirpath))
@@ -169,72 +177,80 @@ class CategorizationProxyStorageBackend(StorageBackend):
                         'type': 'delegate',
                         'reference-container': 'wildland:@default:@parent-container:',
                         'subdirectory': subcontainer_path,
-                        'backend-id': str(uuid.uuid3(ns, dirpath))}]}})
+                        'backend-id': ident}]}})
                 yield PurePosixPath(subcontainer_path), container_stub
             else:
                 yield PurePosixPath(subcontainer_path), None
 
     def _get_categories_to_subcontainer_map(self, dir_path: PurePosixPath) -> \
-            Set[CategorizationSubcontainerMetaInfo]:
+            Dict[str, CategorizationSubcontainerMetaInfo]:
         """
         Recursively traverse directory tree and generate subcontainers' metainformation based on the
         directory names: ``@`` starts new category path, ``_`` joins two categories.
+
+        The result is keyed by directory path, which identifies a subcontainer, so deduplicating
+        does not need to hash titles and category sets.
         """
-        return set(self._get_categories_to_subcontainer_map_recursive(dir_path, '', set(), False))
+        self._category_info_cache.clear()
+        return {metainfo.dir_path: metainfo
+                for metainfo in self._iter_subcontainer_metainfo(str(dir_path))}
 
-    def _get_categories_to_subcontainer_map_recursive(
-            self,
-            dir_path: PurePosixPath,
-            open_category: str,
-            closed_categories: Set[str],
-            category_tag_found: bool) -> Iterator[CategorizationSubcontainerMetaInfo]:
+    def _iter_subcontainer_metainfo(
+            self, root_path: str) -> Iterator[CategorizationSubcontainerMetaInfo]:
         """
-        Recursively traverse directory tree, collect and return all of the metainformation needed to
-        create subcontainers based on the tags embedded in directory names.
+        Traverse directory tree, collect and return all of the metainformation needed to create
+        subcontainers based on the tags embedded in directory names.
         """
-        dir_contains_files = False
-
-        for name in self.inner.readdir(dir_path):
-            path = dir_path / name
-            attr = self.inner.getattr(path)
-            if attr.is_dir():
-                prefix_category, postfix_category = self._get_category_info(name)
-                if postfix_category:
-                    new_category_tag_found = True
-                    closed_category = open_category + prefix_category
-                    closed_category_set = {closed_category} if closed_category else set()
-                    new_closed_categories = closed_categories | closed_category_set
-                    new_open_category = postfix_category
+        # (dir_path, open_category, closed_categories, category_tag_found)
+        # closed_categories are shared between siblings and only replaced when a category is added
+        stack: List[Tuple[str, str, FrozenSet[str], bool]] = \
+            [(root_path, '', frozenset(), False)]
+
+        while stack:
+            dir_path, open_category, closed_categories, category_tag_found = stack.pop()
+            dir_contains_files = False
+
+            for name, is_dir, _ in self.inner.scandir(PurePosixPath(dir_path)):
+                if is_dir:
+                    prefix_category, postfix_category = self._get_category_info(name)
+                    if postfix_category:
+                        new_category_tag_found = True
+                        closed_category = open_category + prefix_category
+                        if closed_category:
+                            new_closed_categories = closed_categories | {closed_category}
+                        else:
+                            new_closed_categories = closed_categories
+                        new_open_category = postfix_category
+                    else:
+                        new_category_tag_found = category_tag_found
+                        new_closed_categories = closed_categories
+                        new_open_category = open_category + prefix_category
+                    stack.append((
+                        name if dir_path == '.' else dir_path + '/' + name,
+                        new_open_category,
+                        new_closed_categories,
+                        new_category_tag_found))
                 else:
-                    new_category_tag_found = category_tag_found
-                    new_closed_categories = closed_categories.copy()
-                    new_open_category = open_category + prefix_category
-                yield from self._get_categories_to_subcontainer_map_recursive(
-                    path,
-                    new_open_category,
-                    new_closed_categories,
-                    new_category_tag_found)
-            else:
-                dir_contains_files = True
+                    dir_contains_files = True
 
-        if dir_contains_files:
-            prefix_category, _, subcontainer_title = open_category.rpartition('/')
+            if dir_contains_files:
+                prefix_category, _, subcontainer_title = open_category.rpartition('/')
 
-            if not category_tag_found and self.with_unclassified_category:
-                assert not closed_categories
-                all_categories = frozenset({self.unclassified_category_path})
-            else:
-                if not prefix_category:
-                    assert subcontainer_title
-                    prefix_category = '/' + subcontainer_title
-                    subcontainer_title = '.'
-                all_categories = frozenset(closed_categories | {prefix_category})
-
-            yield CategorizationSubcontainerMetaInfo(
-                dir_path=dir_path,
-                title=subcontainer_title or '.',
-                categories=all_categories
-            )
+                if not category_tag_found and self.with_unclassified_category:
+                    assert not closed_categories
+                    all_categories = frozenset({self.unclassified_category_path})
+                else:
+                    if not prefix_category:
+                        assert subcontainer_title
+                        prefix_category = '/' + subcontainer_title
+                        subcontainer_title = '.'
+                    all_categories = closed_categories | {prefix_category}
+
+                yield CategorizationSubcontainerMetaInfo(
+                    dir_path=dir_path,
+                    title=subcontainer_title or '.',
+                    categories=all_categories
+                )
 
     def _get_category_info(self, dir_name: str) -> Tuple[str, str]:
         """
@@ -267,16 +283,27 @@ class CategorizationProxyStorageBackend(StorageBackend):
             '@_____'                   ->  ('', '/____')
             '_'                        ->  ('/_', '')
         """
-        prefix, _, postfix = dir_name.partition('@')
+        # the same directory names tend to repeat across the tree
+        cached = self._category_info_cache.get(dir_name)
+        if cached is not None:
+            return cached
 
-        if dir_name.endswith('@') or postfix.find('@') != -1:
+        tags = dir_name.count('@')
+
+        if tags == 0:
+            info = self._filename_to_category_path(dir_name), ''
+        elif tags > 1 or dir_name.endswith('@'):
             logger.debug('Directory [%s] seems to either have multiple category tags or empty '
                          'category tag - treating it as a regular directory without any category '
                          'tag', dir_name)
-            return '/' + dir_name, ''
+            info = '/' + dir_name, ''
+        else:
+            prefix, _, postfix = dir_name.partition('@')
+            info = self._filename_to_category_path(prefix), \
+                   self._filename_to_category_path(postfix)
 
-        return self._filename_to_category_path(prefix), \
-               self._filename_to_category_path(postfix)
+        self._category_info_cache[dir_name] = info
+        return info
 
     @staticmethod
     def _filename_to_category_path(category_path: str) -> str:
@@ -293,4 +320,7 @@ class CategorizationProxyStorageBackend(StorageBackend):
         if category_path == '_':
             return '/_'
 
-        return '/' + re.sub(r'_(_*)', r'/\1', category_path).strip('/')
+        if '_' not in category_path:
+            return '/' + category_path
+
+        return '/' + _CATEGORY_SEPARATOR_RE.sub(r'/\1', category_path).strip('/')
@@ -68,8 +68,9 @@ def get(obj: ContextObj, wlpath, local_file):
     except PathError as ex:
         raise CliError(f"Path error: {ex}") from ex
     search = Search(obj.client, wlpath, obj.client.config.aliases)
-    data = search.read_file()
     try:
-        local_file.write(data)
+        # streamed, so that large files are not held in memory as a whole
+        for chunk in search.iter_read_file():
+            local_file.write(chunk)
     except PathError as ex:
         raise CliError(str(ex)) from ex
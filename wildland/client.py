@@ -151,6 +151,11 @@ class Client:
 
         self._local_users_cache: Dict[Path, Optional[Any]] = {}
         self._local_bridges_cache: Dict[Path, Optional[Any]] = {}
+        self._local_containers_cache: Dict[Path, Optional[Any]] = {}
+        #: stat() results of the cached container manifests, used to detect modified files
+        self._local_containers_stats: Dict[Path, Tuple[int, int, int]] = {}
+        #: result of _verification_state() when the cached container manifests were verified
+        self._local_containers_state: Optional[Tuple] = None
         self._select_reference_storage_cache: Dict[Tuple[str, str, bool],
                                                    Optional[Tuple[PurePosixPath, Dict]]] = {}
 
@@ -193,12 +198,52 @@ class Client:
         self._local_bridges_cache = local_bridges_cache
         return [obj for obj in self._local_bridges_cache.values() if obj is not None]
 
+    def get_local_containers(self) -> List[Container]:
+        """
+        List of local containers (loaded from the appropriate directory).
+
+        Loads local containers and caches. A cached manifest is reused only if its file has not
+        been modified since it was loaded and the keys it was verified with (known keys and
+        local users' pubkeys) have not changed; broken manifests are always reloaded. Every
+        call returns new Container objects (built from the cached, already verified
+        manifests), so callers are free to modify them.
+        """
+        state = self._verification_state()
+        if state != self._local_containers_state:
+            self._local_containers_cache.clear()
+            self._local_containers_stats.clear()
+            self._local_containers_state = state
+
+        local_containers_cache: Dict[Path, Optional[Any]] = dict(
+            self._find_paths_and_load_all(
+                WildlandObject.Type.CONTAINER, cached=self._local_containers_cache,
+                cached_stats=self._local_containers_stats))
+        self._local_containers_cache = local_containers_cache
+        return [WildlandObject.from_manifest(obj.manifest, self, WildlandObject.Type.CONTAINER)
+                for obj in self._local_containers_cache.values() if obj is not None]
+
+    def _verification_state(self) -> Tuple:
+        """
+        Keys that the verification of local manifests depends on: the keys known to the
+        signature context and the pubkeys of the (cached) local users.
+        """
+        sig = self.session.sig
+        return (
+            frozenset(sig.keys.items()),
+            frozenset((key_id, tuple(owners)) for key_id, owners in sig.key_ownership.items()),
+            frozenset((user.owner, tuple(user.pubkeys))
+                      for user in self._local_users_cache.values() if user is not None),
+        )
+
     def clear_cache(self):
         """
-        Clear cache: users, bridges and reference storages.
+        Clear cache: users, bridges, containers and reference storages.
         """
         self._local_users_cache.clear()
         self._local_bridges_cache.clear()
+        self._local_containers_cache.clear()
+        self._local_containers_stats.clear()
+        self._local_containers_state = None
         self._select_reference_storage_cache.clear()
 
     def load_local_storage_cache(self):
@@ -773,9 +818,14 @@ class Client:
                                  base_dir: Path = None,
                                  quiet: bool = False,
                                  reload_cached: bool = False,
-                                 cached: Optional[Dict[Path, Optional[WildlandObject]]] = None):
+                                 cached: Optional[Dict[Path, Optional[WildlandObject]]] = None,
+                                 cached_stats: Optional[Dict[Path, Tuple[int, int, int]]] = None):
         """
         Load and return object manifests with corresponding path from the appropriate directory.
+
+        If ``cached_stats`` is given, a cached object is reused only if the ``stat()`` result of
+        its file is unchanged (``reload_cached`` is ignored then); ``cached_stats`` is replaced
+        with the stats of the files found in this pass once all of them have been loaded.
         """
         if object_type == WildlandObject.Type.USER:
             # Copy sig context and make a new client to avoid propagating recognize_local_keys
@@ -787,9 +837,21 @@ class Client:
             client = self
 
         base_dir = base_dir or self.dirs[object_type]
+        seen_stats: Dict[Path, Tuple[int, int, int]] = {}
         if base_dir.exists():
             for path in sorted(base_dir.glob('*.yaml')):
-                if cached and path in cached and (not reload_cached or cached[path] is None):
+                if cached_stats is not None:
+                    try:
+                        st = path.stat()
+                    except FileNotFoundError:
+                        # removed since glob()
+                        continue
+                    stat = (st.st_ino, st.st_size, st.st_mtime_ns)
+                    seen_stats[path] = stat
+                    if cached and cached.get(path) is not None and cached_stats.get(path) == stat:
+                        yield path, cached[path]
+                        continue
+                elif cached and path in cached and (not reload_cached or cached[path] is None):
                     yield path, cached[path]
                     continue
                 try:
@@ -802,6 +864,10 @@ class Client:
                 else:
                     yield path, obj_
 
+        if cached_stats is not None:
+            cached_stats.clear()
+            cached_stats.update(seen_stats)
+
     def load_users_with_bridge_paths(self, only_default_user: bool = False) -> \
             Iterable[Tuple[User, Optional[List[PurePosixPath]]]]:
         """
@@ -27,7 +27,7 @@ The container
 from copy import deepcopy
 from pathlib import PurePosixPath, Path
 import uuid
-from typing import Optional, List, Union, Any, Dict
+from typing import Optional, List, Union, Any, Dict, FrozenSet
 import itertools
 
 from wildland.wildland_object.wildland_object import WildlandObject, PublishableWildlandObject
@@ -85,6 +85,7 @@ class Container(PublishableWildlandObject, obj_type=WildlandObject.Type.CONTAINE
         self.categories = deepcopy(categories) if categories else []
         self.client = client
         self._expanded_paths: Optional[List[PurePosixPath]] = None
+        self._expanded_paths_set: Optional[FrozenSet[PurePosixPath]] = None
         self.manifest = manifest
         self.access = deepcopy(access)
 
@@ -284,6 +285,15 @@ class Container(PublishableWildlandObject, obj_type=WildlandObject.Type.CONTAINE
         self._expanded_paths = paths
         return self._expanded_paths
 
+    @property
+    def expanded_paths_set(self) -> FrozenSet[PurePosixPath]:
+        """
+        :attr:`expanded_paths` as a set, for fast membership tests.
+        """
+        if self._expanded_paths_set is None:
+            self._expanded_paths_set = frozenset(self.expanded_paths)
+        return self._expanded_paths_set
+
     def fill_storage_fields(self, storage_dict):
         """
         Fill fields of a storage dict with data from this container. Returns the modified dict,
@@ -36,6 +36,9 @@ from .log import get_logger
 
 logger = get_logger('control-server')
 
+MESSAGE_SEPARATOR = b'\n\n'
+RECV_SIZE = 64 * 1024
+
 
 class ControlClientError(WildlandError):
     """
@@ -56,7 +59,7 @@ class ControlClient:
 
     def __init__(self):
         self.conn = None
-        self.conn_file = None
+        self.recv_buffer = b''
         self.pending_events = []
         self.id_counter = 1
 
@@ -71,7 +74,7 @@ class ControlClient:
         except OSError as e:
             raise ControlClientUnableToConnectError from e
 
-        self.conn_file = self.conn.makefile()
+        self.recv_buffer = b''
 
     def disconnect(self) -> None:
         """
@@ -79,10 +82,8 @@ class ControlClient:
         """
 
         assert self.conn
-        assert self.conn_file
 
-        self.conn_file.close()
-        self.conn_file = None
+        self.recv_buffer = b''
         self.conn.close()
         self.conn = None
 
@@ -95,7 +96,6 @@ class ControlClient:
         """
 
         assert self.conn
-        assert self.conn_file
 
         request = ControlRequest(cmd=name, args=kwargs, request_id=self.id_counter)
         logger.debug('cmd: %s', request)
@@ -144,10 +144,22 @@ class ControlClient:
         message = self._recv_message()
         if not message:
             return []
-        if 'event' not in message:
-            raise ControlClientError(f'Unexpected message: {message}')
-        logger.debug('event: %s', message['event'])
-        return [message['event']]
+        return [self._get_event(message)]
+
+    def iter_event_batches(self) -> Iterator[List[dict]]:
+        """
+        Iterate over batches of events from server, one batch per wake-up.
+
+        Once woken up, this also drains all the events the server has sent in the
+        meantime, so that a burst of events is returned as a single batch.
+        """
+
+        while True:
+            events = self.wait_for_events()
+            if not events:
+                break
+            events.extend(self._recv_buffered_events())
+            yield events
 
     def iter_events(self) -> Iterator[dict]:
         """
@@ -160,22 +172,60 @@ class ControlClient:
                 break
             yield from events
 
+    @staticmethod
+    def _get_event(message: dict):
+        if 'event' not in message:
+            raise ControlClientError(f'Unexpected message: {message}')
+        logger.debug('event: %s', message['event'])
+        return message['event']
+
+    def _drain(self) -> None:
+        """
+        Read everything the server has sent so far into the receive buffer, without blocking.
+        """
+
+        assert self.conn
+
+        while True:
+            try:
+                data = self.conn.recv(RECV_SIZE, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                return
+            if not data:
+                return
+            self.recv_buffer += data
+
+    def _recv_buffered_events(self) -> List[dict]:
+        """
+        Receive all the complete events the server has already sent, without blocking.
+        """
+
+        self._drain()
+        events = []
+        while MESSAGE_SEPARATOR in self.recv_buffer:
+            message = self._recv_message()
+            if not message:
+                break
+            events.append(self._get_event(message))
+        return events
+
     def _recv_message(self) -> Optional[dict]:
         """
         Receive a message from the server. Returns ``None`` on ``EOF``.
         """
 
-        assert self.conn_file
+        assert self.conn
 
-        lines = []
-        for line in self.conn_file:
-            lines.append(line)
-            if line == '\n':
+        while MESSAGE_SEPARATOR not in self.recv_buffer:
+            data = self.conn.recv(RECV_SIZE)
+            if not data:
                 break
-        # TODO: this doesn't distinguish empty lines from EOF
-        # (in case of empty lines, we should raise an error).
-        response_str = ''.join(lines)
-        if response_str.strip() == '':
+            self.recv_buffer += data
+
+        message_bytes, _, self.recv_buffer = self.recv_buffer.partition(MESSAGE_SEPARATOR)
+        # TODO: this doesn't distinguish empty messages from EOF
+        # (in case of empty messages, we should raise an error).
+        if message_bytes.strip() == b'':
             return None
 
-        return json.loads(response_str)
+        return json.loads(message_bytes)
@@ -411,7 +411,8 @@ class WildlandFSBase:
         with self.mount_lock:
             storage = self.storages[resolved.ident]
 
-        if not hasattr(storage, method_name):
+        method = getattr(storage, method_name, None)
+        if method is None:
             raise IOError(errno.ENOSYS, str(path))
 
         if modify and storage.read_only:
@@ -420,7 +421,7 @@ class WildlandFSBase:
         relpath = self._get_storage_relative_path(path.name, resolved, parent)
 
         try:
-            result = getattr(storage, method_name)(relpath, *args, **kwargs)
+            result = method(relpath, *args, **kwargs)
         except PermissionError as e:
             err = e.errno or errno.EACCES
             raise PermissionError(err, str(e)) from e
@@ -401,6 +401,27 @@ class WildlandFSClient:
         self.clear_cache()
         self.run_control_command('unmount', storage_id=storage_id)
 
+    def unmount_storages(self, storage_ids: Iterable[int]) -> Dict[int, WildlandError]:
+        """
+        Unmount storages with given storage ids, sending all the commands over a single control
+        connection. A failed unmount does not stop the remaining ones; the errors are returned by
+        storage id.
+        """
+
+        self.clear_cache()
+        errors: Dict[int, WildlandError] = {}
+        client = ControlClient()
+        client.connect(self.socket_path)
+        try:
+            for storage_id in storage_ids:
+                try:
+                    client.run_command('unmount', storage_id=storage_id)
+                except WildlandError as e:
+                    errors[storage_id] = e
+        finally:
+            client.disconnect()
+        return errors
+
     def find_primary_storage_id(self, container: Container) -> Optional[int]:
         """
         Find primary storage ID for a given container.
@@ -948,7 +969,7 @@ class WildlandFSClient:
 
         for container, storage in containers_storage.items():
             params = storage.params
-            logger.debug('watching for subcontainers: storage %s', str({params["backend-id"]}))
+            logger.debug('watching for subcontainers: storage %s', params["backend-id"])
             watch_id = control_client.run_command('add-subcontainer-watch', backend_param=params)
             watches[watch_id] = (container, storage)
 
@@ -962,14 +983,19 @@ class WildlandFSClient:
             if initial:
                 yield initial
 
-        for events in control_client.iter_events():
+        # Each batch holds everything the daemon sent before we woke up, so that a burst
+        # of changes is handled at once instead of one wake-up per message.
+        for batch in control_client.iter_event_batches():
             watch_events = []
-            for event in events:
+            # watch id -> subcontainers by path, so that a batch of subcontainer events
+            # enumerates the children of each watched storage only once
+            children: Dict[int, Dict[PurePosixPath, Optional[ContainerStub]]] = {}
+            for event in itertools.chain.from_iterable(batch):
                 watch_id = event['watch-id']
                 # subcontainer event
                 if isinstance(watches[watch_id][0], Container):
-                    watch_events.append(
-                        WildlandFSClient._handle_subcontainer_event(wl_client, event, watches))
+                    watch_events.append(WildlandFSClient._handle_subcontainer_event(
+                        wl_client, event, watches, children))
                 else:  # file event
                     watch_events.append(WildlandFSClient._handle_event(event, watches))
             yield watch_events
@@ -1006,20 +1032,17 @@ class WildlandFSClient:
         return initial
 
     @staticmethod
-    def _handle_subcontainer_event(wl_client, event, watches):
+    def _handle_subcontainer_event(wl_client, event, watches, children):
         event_type = FileEventType[event['type']]
         watch_id = event['watch-id']
         container, storage = watches[watch_id]
-        params = storage.params
-        sb = StorageBackend.from_params(params, deduplicate=True)
         path = PurePosixPath(event['path'])
-        subcontainer = None
-        with sb:
-            for sub_path, sub in sb.get_children(wl_client):
-                if sub_path == path:
-                    assert sub is not None
-                    subcontainer = sub
-                    break
-            else:
-                logger.error('Subcontainer path not found: %s', path)
+        if watch_id not in children:
+            params = storage.params
+            sb = StorageBackend.from_params(params, deduplicate=True)
+            with sb:
+                children[watch_id] = dict(sb.get_children(wl_client))
+        subcontainer = children[watch_id].get(path)
+        if subcontainer is None:
+            logger.error('Subcontainer path not found: %s', path)
         return SubcontainerWatchEvent(event_type, path, container, storage, subcontainer)
@@ -25,7 +25,10 @@
 Monitor container manifests for changes and remount if necessary
 """
 
+import logging
 import os
+import time
+from array import array
 from pathlib import PurePosixPath, Path
 from typing import List, Optional, Tuple, Iterable, Dict, Set
 
@@ -35,15 +38,17 @@ from wildland.exc import WildlandError
 from wildland.fs_client import WildlandFSClient, WatchEvent, PatternWatchEvent, \
     SubcontainerWatchEvent
 from wildland.storage import Storage
-from wildland.storage_backends.base import StorageBackend
 from wildland.storage_backends.watch import FileEventType
 from wildland.wildland_object.wildland_object import WildlandObject
-from wildland.search import Search
 from wildland.wlpath import WildlandPath
 from wildland.log import get_logger
 
 logger = get_logger('remounter')
 
+#: After flushing queued (un)mounts, wait this long (in seconds) before handling further events,
+#: so that a burst of changes results in a single mount request instead of many.
+DEBOUNCE_INTERVAL = 0.5
+
 
 class Remounter:
     """
@@ -82,7 +87,8 @@ class Remounter:
                                   Iterable[Storage],
                                   Iterable[Iterable[PurePosixPath]],
                                   Optional[Container]]] = []
-        self.to_unmount: List[int] = []
+        # storage ids, kept as a compact array of machine ints
+        self.to_unmount = array('i')
 
         # manifest path -> main container path
         self.main_paths: Dict[PurePosixPath, PurePosixPath] = {}
@@ -113,10 +119,14 @@ class Remounter:
             self.outside_containers.extend(self.client.load_containers_from(name))
 
         self.with_subcontainers = with_subcontainers
+        self.debounce_interval = DEBOUNCE_INTERVAL
 
         # wlpath -> resolved containers (stored as its main path)
         self.wlpath_main_paths: Dict[WildlandPath, Set[PurePosixPath]] = {}
 
+        # owner -> bridge paths, valid while handling a single batch of events
+        self.bridge_paths: Dict[str, Iterable[Iterable[PurePosixPath]]] = {}
+
     def run(self):
         """
         Run the main loop.
@@ -128,7 +138,7 @@ class Remounter:
             containers = self.outside_containers + self.inside_containers
             if patterns:
                 logger.info('Using patterns: %r', patterns)
-            if containers:
+            if containers and logger.isEnabledFor(logging.INFO):
                 logger.info('Watching containers: %s', '\n'.join((c.uuid for c in containers)))
 
             for events in self.fs_client.watch(
@@ -139,8 +149,13 @@ class Remounter:
             ):
                 any_wlpath_changed, container_changed = self.handle_events(events)
 
+                flushed = bool(self.to_mount or self.to_unmount)
                 self.unmount_pending()
                 self.mount_pending()
+                if flushed:
+                    # The first change after a quiet period is applied immediately, anything
+                    # arriving within the debounce window gets drained as one batch next time.
+                    time.sleep(self.debounce_interval)
 
                 any_pattern_changed = False
                 if any_wlpath_changed:
@@ -159,6 +174,7 @@ class Remounter:
         :return True if patterns have changed
         """
 
+        self.bridge_paths.clear()
         if self.with_subcontainers:
             # (re)mounting containers from "outside" the wildland file system
             for container in self.outside_containers:
@@ -167,6 +183,9 @@ class Remounter:
 
         patterns: Dict[str, List[WildlandPath]] = {}
         for wlpath in self.wlpaths:
+            # pylint: disable=import-outside-toplevel
+            from wildland.search import Search
+
             search = Search(self.client, wlpath,
                             aliases=self.client.config.aliases,
                             fs_client=self.fs_client)
@@ -194,6 +213,8 @@ class Remounter:
         Handle a single batch of watch event.
         Returns whether there may be a need to recalculate watch patterns
         """
+        # bridges may have changed since the previous batch
+        self.bridge_paths.clear()
         any_wlpath_changed = False
         container_with_children_changed = False
         # avoid processing the same wlpath multiple times - each time we re-evaluate
@@ -221,24 +242,33 @@ class Remounter:
 
         logger.info('WL path \'%s\' event %s: %s', wlpath, event.event_type, event.path)
 
+        # pylint: disable=import-outside-toplevel
+        from wildland.search import Search
+
         search = Search(self.client, wlpath,
                         aliases=self.client.config.aliases,
                         fs_client=self.fs_client)
 
         new_main_paths = set()
+        stale_main_paths = set(self.wlpath_main_paths.get(wlpath, ()))
         try:
+            # containers are queued as the search yields them, without collecting them first
             for container in search.read_container():
                 main_path = self.fs_client.get_user_container_path(
                     container.owner, container.paths[0])
+                if main_path in new_main_paths:
+                    # the same container reached through a different route, already queued
+                    continue
                 self.handle_changed_container(container)
                 new_main_paths.add(main_path)
+                stale_main_paths.discard(main_path)
 
-            for main_path in self.wlpath_main_paths.get(wlpath, set()).difference(new_main_paths):
+            for main_path in stale_main_paths:
                 storage_id, pseudo_storage_id = self.fs_client.find_storage_id_by_path(main_path)
                 if storage_id is not None:
                     assert pseudo_storage_id is not None
                     logger.info('  (unmount %d)', storage_id)
-                    self.to_unmount += [storage_id, pseudo_storage_id]
+                    self.to_unmount.extend((storage_id, pseudo_storage_id))
                 else:
                     logger.info('  (not mounted)')
         except Exception:
@@ -264,21 +294,18 @@ class Remounter:
             storage_id: Optional[int] = None
             pseudo_storage_id: Optional[int] = None
 
-            if event.path in self.main_paths:
-                storage_id, pseudo_storage_id = self.fs_client.find_storage_id_by_path(
-                    self.main_paths[event.path])
+            # Stop tracking the file
+            main_path = self.main_paths.pop(event.path, None)
+            if main_path is not None:
+                storage_id, pseudo_storage_id = self.fs_client.find_storage_id_by_path(main_path)
 
                 if storage_id is not None:
                     assert pseudo_storage_id is not None
                     logger.info('  (unmount %d)', storage_id)
-                    self.to_unmount += [storage_id, pseudo_storage_id]
+                    self.to_unmount.extend((storage_id, pseudo_storage_id))
                 else:
                     logger.info('  (not mounted)')
 
-                # Stop tracking the file
-                if event.path in self.main_paths:
-                    del self.main_paths[event.path]
-
         # Handle create/modify:
 
         container_with_children_changed = False
@@ -295,6 +322,9 @@ class Remounter:
                         self.inside_containers.append(container)
                         container_with_children_changed = True
                     elif container not in self.inside_containers:
+                        # pylint: disable=import-outside-toplevel
+                        from wildland.storage_backends.base import StorageBackend
+
                         params = storage.params
                         sb = StorageBackend.from_params(params, deduplicate=True)
                         with sb:
@@ -336,10 +366,14 @@ class Remounter:
         :param container: container to (re)mount
         :return:
         """
-        user_paths = self.client.get_bridge_paths_for_user(container.owner)
+        # a burst of events usually concerns containers of the same few owners
+        user_paths = self.bridge_paths.get(container.owner)
+        if user_paths is None:
+            user_paths = self.client.get_bridge_paths_for_user(container.owner)
+            self.bridge_paths[container.owner] = user_paths
         storages = self.client.get_storages_to_mount(container)
         if self.fs_client.find_primary_storage_id(container) is None:
-            logger.info('  new: %s', str(container))
+            logger.info('  new: %s', container)
             self.to_mount.append((container, storages, user_paths, None))
         else:
             storages_to_remount = []
@@ -349,7 +383,7 @@ class Remounter:
                 assert storage_id is not None
                 assert pseudo_storage_id is not None
                 logger.info('  (removing orphan storage %s @ id: %d)', path, storage_id)
-                self.to_unmount += [storage_id, pseudo_storage_id]
+                self.to_unmount.extend((storage_id, pseudo_storage_id))
 
             for storage in storages:
                 if self.fs_client.should_remount(container, storage, user_paths):
@@ -365,19 +399,31 @@ class Remounter:
         """
         Unmount queued containers.
         """
-        for storage_id in self.to_unmount:
+        if self.to_unmount:
+            # the same storage may have been queued by several events
+            storage_ids = list(dict.fromkeys(self.to_unmount))
             try:
-                self.fs_client.unmount_storage(storage_id)
+                errors = self.fs_client.unmount_storages(storage_ids)
             except WildlandError as e:
-                logger.error('failed to unmount storage %d: %s', storage_id, e)
-        self.to_unmount.clear()
+                logger.error('failed to unmount storages %s: %s', storage_ids, e)
+            else:
+                for storage_id, error in errors.items():
+                    logger.error('failed to unmount storage %d: %s', storage_id, error)
+        del self.to_unmount[:]
 
     def mount_pending(self):
         """
         Mount queued containers.
+
+        If a container was queued several times (e.g. created and then modified within one
+        batch), only the last entry is mounted: each entry is computed against the same,
+        not yet updated, mount state, so the last one covers the earlier ones.
         """
+        pending = {}
+        for entry in self.to_mount:
+            pending[entry[0].uuid] = entry
         try:
-            self.fs_client.mount_multiple_containers(self.to_mount, remount=True)
+            self.fs_client.mount_multiple_containers(list(pending.values()), remount=True)
         except WildlandError as e:
             logger.error('failed to mount some storages: %s', e)
         self.to_mount.clear()
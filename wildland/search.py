@@ -28,10 +28,13 @@ Utilities for URL resolving and traversing the path
 from __future__ import annotations
 from copy import deepcopy
 
+import sys
 import types
 from dataclasses import dataclass
+from functools import cached_property, partial
+from itertools import islice
 from pathlib import PurePosixPath
-from typing import Optional, Tuple, Iterable, Mapping, List, Set, Union, Dict
+from typing import Optional, Tuple, Iterable, Iterator, Mapping, List, Set, Union, Dict
 from typing import TYPE_CHECKING
 
 import wildland
@@ -45,8 +48,10 @@ from .storage import Storage
 from .storage_backends.base import StorageBackend
 from .manifest.manifest import ManifestError
 from .wlpath import WildlandPath, PathError
+from .link import Link
 from .exc import WildlandError
 from .log import get_logger
+from .utils import PARALLEL_MAP_WORKERS, parallel_map
 
 if TYPE_CHECKING:
     import wildland.client  # pylint: disable=cyclic-import
@@ -132,11 +137,46 @@ class Search:
         self.wlpath = WildlandPath.from_str(wlpath) if isinstance(wlpath, str) else wlpath
         self.aliases = aliases
         self.initial_owner = self._subst_alias(self.wlpath.owner or '@default')
+        if self.initial_owner is not None:
+            # owners are used as index keys, interning makes the lookups compare by identity
+            self.initial_owner = sys.intern(self.initial_owner)
         self.fs_client = fs_client
 
-        self.local_containers = list(self.client.load_all(WildlandObject.Type.CONTAINER))
-        self.local_users = self.client.get_local_users(reload=True)
-        self.local_bridges = self.client.get_local_bridges(reload=True)
+        self.local_containers = self.client.get_local_containers()
+
+        #: (owner, path) -> local containers available under that path
+        self._local_containers_by_path = self._index_by_path(
+            self.local_containers, lambda container: container.expanded_paths)
+        #: owner -> local containers of that owner (for '*' parts)
+        self._local_containers_by_owner = self._index_by_owner(self.local_containers)
+
+        #: storages selected for containers during this search, keyed by id() of the container
+        #: (the container itself is kept in the value, so that the id stays valid)
+        self._storage_cache: Dict[int, Tuple[Container, Storage, StorageBackend]] = {}
+
+    @cached_property
+    def local_users(self) -> List[User]:
+        """
+        Local user manifests, loaded on first access.
+        """
+        return self.client.get_local_users(reload=True)
+
+    @cached_property
+    def local_bridges(self) -> List[Bridge]:
+        """
+        Local bridge manifests, loaded on first access.
+        """
+        return self.client.get_local_bridges(reload=True)
+
+    @cached_property
+    def _local_bridges_by_path(self) -> Dict[Tuple[str, PurePosixPath], List[Bridge]]:
+        #: (owner, path) -> local bridges available under that path
+        return self._index_by_path(self.local_bridges, lambda bridge: bridge.paths)
+
+    @cached_property
+    def _local_bridges_by_owner(self) -> Dict[str, List[Bridge]]:
+        #: owner -> local bridges of that owner (for '*' parts)
+        return self._index_by_owner(self.local_bridges)
 
     def resolve_raw(self) -> Iterable[Step]:
         """
@@ -196,6 +236,35 @@ class Search:
 
         raise FileNotFoundError
 
+    def iter_read_file(self) -> Iterator[bytes]:
+        """
+        Read a file under the Wildland path in chunks (see :meth:`StorageDriver.iter_read_file`).
+        Like :meth:`read_file`, this uses the first container where the file exists.
+        """
+
+        if self.wlpath.file_path is None:
+            raise PathError(f'Expecting a file path, not a container path: {self.wlpath}')
+
+        for step in self._resolve_all():
+            if not step.container:
+                continue
+            try:
+                _, storage_backend = self._find_storage(step)
+            except ManifestError:
+                continue
+            with StorageDriver(storage_backend) as driver:
+                chunks = driver.iter_read_file(self.wlpath.file_path.relative_to('/'))
+                try:
+                    # the file is opened when the first chunk is requested
+                    first = next(chunks, b'')
+                except FileNotFoundError:
+                    continue
+                yield first
+                yield from chunks
+                return
+
+        raise FileNotFoundError
+
     def write_file(self, data: bytes, create_parents: bool = False):
         """
         Read a file under the Wildland path.
@@ -211,6 +280,8 @@ class Search:
                 _, storage_backend = self._find_storage(step)
             except ManifestError:
                 continue
+            # the written file may be a manifest, so do not rely on selected storages anymore
+            self._storage_cache.clear()
             try:
                 with StorageDriver(storage_backend) as driver:
                     if create_parents:
@@ -305,47 +376,67 @@ class Search:
     def _resolve_all(self) -> Iterable[Step]:
         """
         Resolve all path parts, yield all results that match.
+
+        This is a depth-first search over the path parts. Steps found for each
+        (previous step, part) pair are deduplicated and cached in :attr:`_resolve_cache`.
         """
 
+        # backends mounted during this resolution, keyed by id() of the backend; they are kept
+        # mounted until the resolution ends, so sibling steps don't remount them
+        mounted: Dict[int, StorageBackend] = {}
         # deduplicate results
         seen_last = set()
-        # deduplicate and cache result of self._resolve_first(); it's here,
-        # because _resolve_first() structure does not have a single place for
-        # returning results, and is using `yield from`, so deduplicating it
-        # there would require quite a bit of boilerplate there
-        seen_first = set()
-        cache_key = (self.initial_owner, self.wlpath.parts[0])
-        if cache_key in self._resolve_cache:
-            first_iter = self._resolve_cache[cache_key]
-        else:
-            first_iter = self._resolve_first()
-        for step in first_iter:
-            if step in seen_first:
-                continue
-            seen_first.add(step)
-            for last_step in self._resolve_rest(step, 1):
-                if last_step not in seen_last:
-                    yield last_step
-                    seen_last.add(last_step)
-        self._resolve_cache[cache_key] = seen_first
-
-    def _resolve_rest(self, step: Step, i: int) -> Iterable[Step]:
-        if i == len(self.wlpath.parts):
-            yield step
-            return
+        last = len(self.wlpath.parts) - 1
+        # (steps iterator, index of the part it resolves, cache key, steps seen so far)
+        stack: List[Tuple[Iterator[Step], int, Tuple[Union[str, Step], PurePosixPath],
+                          Set[Step]]] = []
+
+        def push(i: int, cache_key: Tuple[Union[str, Step], PurePosixPath], resolve):
+            if cache_key in self._resolve_cache:
+                steps = self._resolve_cache[cache_key]
+            else:
+                steps = resolve()
+            stack.append((iter(steps), i, cache_key, set()))
 
-        seen = set()
-        cache_key = (step, self.wlpath.parts[i])
-        if cache_key in self._resolve_cache:
-            next_steps = self._resolve_cache[cache_key]
-        else:
-            next_steps = self._resolve_next(step, i)
-        for next_step in next_steps:
-            if next_step in seen:
-                continue
-            seen.add(next_step)
-            yield from self._resolve_rest(next_step, i + 1)
-        self._resolve_cache[cache_key] = seen
+        try:
+            push(0, (self.initial_owner, self.wlpath.parts[0]),
+                 partial(self._resolve_first, mounted))
+            while stack:
+                steps, i, cache_key, seen = stack[-1]
+                step = next(steps, None)
+                if step is None:
+                    stack.pop()
+                    self._resolve_cache[cache_key] = seen
+                    continue
+                if step in seen:
+                    continue
+                seen.add(step)
+
+                if i < last:
+                    push(i + 1, (step, self.wlpath.parts[i + 1]),
+                         partial(self._resolve_next, step, i + 1, mounted))
+                elif step not in seen_last:
+                    seen_last.add(step)
+                    yield step
+        finally:
+            self._unmount_all(mounted)
+
+    @staticmethod
+    def _mount(storage_backend: StorageBackend, mounted: Dict[int, StorageBackend]) -> None:
+        """
+        Mount the backend, unless it is already in ``mounted`` (the backends mounted during the
+        current resolution).
+        """
+
+        if id(storage_backend) not in mounted:
+            storage_backend.request_mount()
+            mounted[id(storage_backend)] = storage_backend
+
+    @staticmethod
+    def _unmount_all(mounted: Dict[int, StorageBackend]) -> None:
+        for storage_backend in mounted.values():
+            storage_backend.request_unmount()
+        mounted.clear()
 
     def _find_storage(self, step: Step) -> Tuple[Storage, StorageBackend]:
         """
@@ -358,16 +449,22 @@ class Search:
         """
 
         assert step.container is not None
+        cached = self._storage_cache.get(id(step.container))
+        if cached is not None:
+            return cached[1], cached[2]
+
         storage = self.client.select_storage(step.container)
-        return storage, StorageBackend.from_params(storage.params, deduplicate=True)
+        storage_backend = StorageBackend.from_params(storage.params, deduplicate=True)
+        self._storage_cache[id(step.container)] = (step.container, storage, storage_backend)
+        return storage, storage_backend
 
-    def _resolve_first(self):
+    def _resolve_first(self, mounted: Dict[int, StorageBackend]):
         if self.wlpath.hint:
             hint_user = self.client.load_object_from_url(WildlandObject.Type.USER, self.wlpath.hint,
                                                          self.initial_owner, self.initial_owner)
 
             for step in self._user_step(hint_user, self.initial_owner, self.client, None, None):
-                yield from self._resolve_next(step, 0)
+                yield from self._resolve_next(step, 0, mounted)
 
         # Try local containers
         yield from self._resolve_local(self.wlpath.parts[0], self.initial_owner, None)
@@ -376,7 +473,7 @@ class Search:
         for user in self.local_users:
             if user.owner == self.initial_owner:
                 for step in self._user_step(user, self.initial_owner, self.client, None, None):
-                    yield from self._resolve_next(step, 0)
+                    yield from self._resolve_next(step, 0, mounted)
 
     def _resolve_local(self, part: PurePosixPath,
                        owner: str,
@@ -386,31 +483,42 @@ class Search:
         of a given owner.
         """
 
-        for container in self.local_containers:
-            if container.owner == owner and (
-                    str(part) == '*' or
-                    part in container.expanded_paths):
-                logger.debug('%s: local container: %s', part,
-                             container.local_path)
-                yield Step(
-                    owner=self.initial_owner,
-                    client=self.client,
-                    container=container,
-                    user=None,
-                    bridge=None,
-                    previous=step,
-                )
+        wildcard = str(part) == '*'
+        if wildcard:
+            containers = self._local_containers_by_owner.get(owner, [])
+        else:
+            containers = self._local_containers_by_path.get((owner, part), [])
 
-        for bridge in self.local_bridges:
-            if bridge.owner == owner and (str(part) == '*' or part in bridge.paths):
-                logger.debug('%s: local bridge manifest: %s', part,
-                             bridge.local_path)
-                yield from self._bridge_step(
-                    self.client, owner, part, None, None, bridge, step)
+        for container in containers:
+            logger.debug('%s: local container: %s', part,
+                         container.local_path)
+            yield Step(
+                owner=self.initial_owner,
+                client=self.client,
+                container=container,
+                user=None,
+                bridge=None,
+                previous=step,
+            )
+
+        # looked up only now, so that local bridges are not loaded at all if the caller
+        # is satisfied with a container
+        if wildcard:
+            bridges = self._local_bridges_by_owner.get(owner, [])
+        else:
+            bridges = self._local_bridges_by_path.get((owner, part), [])
 
-    def _resolve_next(self, step: Step, i: int) -> Iterable[Step]:
+        for bridge in bridges:
+            logger.debug('%s: local bridge manifest: %s', part,
+                         bridge.local_path)
+            yield from self._bridge_step(
+                self.client, owner, part, None, None, bridge, step)
+
+    def _resolve_next(self, step: Step, i: int,
+                      mounted: Dict[int, StorageBackend]) -> Iterable[Step]:
         """
-        Resolve next part by looking up a manifest in the current container.
+        Resolve next part by looking up a manifest in the current container. Backends mounted
+        for that are added to ``mounted`` and left for the caller to unmount.
         """
 
         if not step.container:
@@ -433,52 +541,103 @@ class Search:
             logger.debug('Storage %s does not support subcontainers - cannot look for %s inside',
                          storage.params["type"], part)
             return
-        with storage_backend:
+        self._mount(storage_backend, mounted)
+        try:
+            children_iter = storage_backend.get_children(step.client, part)
+        except NotImplementedError:
+            logger.warning('Storage %s does not support subcontainers - cannot look for %s '
+                           'inside', storage.params["type"], part)
+            return
+
+        # load_subcontainer_object() only accepts objects owned by the owner of step.container,
+        # so if that is the step owner, the owner check in the steps below can be skipped
+        owner_verified = step.container.owner == step.owner
+
+        for manifest_path, subcontainer_data in self._prefetch_children(storage_backend,
+                                                                        children_iter):
             try:
-                children_iter = storage_backend.get_children(step.client, part)
-            except NotImplementedError:
-                logger.warning('Storage %s does not support subcontainers - cannot look for %s '
-                               'inside', storage.params["type"], part)
+                assert subcontainer_data is not None
+                container_or_bridge = step.client.load_subcontainer_object(
+                    step.container, storage, subcontainer_data)
+            except (ManifestError, WildlandError) as e:
+                logger.warning('%s: cannot load subcontainer %s: %s', part, manifest_path, e)
+                continue
+
+            if isinstance(container_or_bridge, Container):
+                if container_or_bridge == step.container:
+                    # manifests catalog published into itself
+                    container_or_bridge.is_manifests_catalog = True
+                logger.debug('%s: container manifest: %s', part, subcontainer_data)
+                yield from self._container_step(
+                    step, part, container_or_bridge, owner_verified)
+            elif isinstance(container_or_bridge, Bridge):
+                logger.debug('%s: bridge manifest: %s', part, subcontainer_data)
+                yield from self._bridge_step(
+                    step.client, step.owner,
+                    part, manifest_path, storage_backend,
+                    container_or_bridge,
+                    step, owner_verified)
+
+    @classmethod
+    def _prefetch_children(cls, storage_backend: StorageBackend, children: Iterable[Tuple]) \
+            -> Iterator[Tuple]:
+        """
+        Pass through the ``(manifest_path, subcontainer_data)`` pairs from
+        :meth:`StorageBackend.get_children`, prefetching link targets a batch of
+        :data:`~wildland.utils.PARALLEL_MAP_WORKERS` children ahead, so that a caller which
+        stops early does not pay for the whole listing.
+        """
+        children_iter = iter(children)
+        while True:
+            batch = list(islice(children_iter, PARALLEL_MAP_WORKERS))
+            if not batch:
                 return
+            links = [subcontainer_data for _, subcontainer_data in batch
+                     if isinstance(subcontainer_data, Link)]
+            if links:
+                cls._prefetch_links(storage_backend, links)
+            yield from batch
+
+    @staticmethod
+    def _prefetch_links(storage_backend: StorageBackend, links: List[Link]) -> None:
+        """
+        Read the target files of the given links concurrently, so that loading them afterwards
+        does not wait for the storage one file at a time. Only links to ``storage_backend``,
+        which is expected to be mounted already, are read; failures are ignored here and
+        reported when the link is loaded.
+        """
+        to_fetch = [link for link in links
+                    if link.file_bytes is None
+                    and link.storage_driver.storage_backend is storage_backend]
+        if len(to_fetch) < 2:
+            return
 
-            for manifest_path, subcontainer_data in children_iter:
-                try:
-                    assert subcontainer_data is not None
-                    container_or_bridge = step.client.load_subcontainer_object(
-                        step.container, storage, subcontainer_data)
-                except (ManifestError, WildlandError) as e:
-                    logger.warning('%s: cannot load subcontainer %s: %s', part, manifest_path, e)
-                    continue
+        def fetch(link):
+            try:
+                # the backend is kept mounted by the Search, so the driver is not entered here;
+                # doing so from multiple threads would race on its mount counter
+                link.file_bytes = link.storage_driver.read_file(link.file_path.relative_to('/'))
+            except (WildlandError, OSError):
+                pass
 
-                if isinstance(container_or_bridge, Container):
-                    if container_or_bridge == step.container:
-                        # manifests catalog published into itself
-                        container_or_bridge.is_manifests_catalog = True
-                    logger.debug('%s: container manifest: %s', part, subcontainer_data)
-                    yield from self._container_step(
-                        step, part, container_or_bridge)
-                elif isinstance(container_or_bridge, Bridge):
-                    logger.debug('%s: bridge manifest: %s', part, subcontainer_data)
-                    yield from self._bridge_step(
-                        step.client, step.owner,
-                        part, manifest_path, storage_backend,
-                        container_or_bridge,
-                        step)
+        parallel_map(fetch, to_fetch)
 
     # pylint: disable=no-self-use
 
     def _container_step(self,
                         step: Step,
                         part: PurePosixPath,
-                        container: Container) -> Iterable[Step]:
+                        container: Container,
+                        owner_verified: bool = False) -> Iterable[Step]:
 
-        try:
-            self._verify_owner(container, step.owner)
-        except WildlandError as e:
-            logger.warning('container %s of user %s: %s', container, step.owner, str(e))
-            return
+        if not owner_verified:
+            try:
+                self._verify_owner(container, step.owner)
+            except WildlandError as e:
+                logger.warning('container %s of user %s: %s', container, step.owner, str(e))
+                return
 
-        if str(part) != '*' and part not in container.expanded_paths:
+        if str(part) != '*' and part not in container.expanded_paths_set:
             logger.debug('%s: path not found in manifest, skipping', part)
             return
 
@@ -498,9 +657,11 @@ class Search:
                      manifest_path: Optional[PurePosixPath],
                      storage_backend: Optional[StorageBackend],
                      bridge: Bridge,
-                     step: Optional[Step]) -> Iterable[Step]:
+                     step: Optional[Step],
+                     owner_verified: bool = False) -> Iterable[Step]:
 
-        self._verify_owner(bridge, owner)
+        if not owner_verified:
+            self._verify_owner(bridge, owner)
 
         if str(part) != '*' and part not in bridge.paths:
             return
@@ -601,6 +762,22 @@ class Search:
                     obj.owner, expected_owner
                 ))
 
+    @staticmethod
+    def _index_by_path(objects, get_paths) -> Dict[Tuple[str, PurePosixPath], List]:
+        index: Dict[Tuple[str, PurePosixPath], List] = {}
+        for obj in objects:
+            # dict.fromkeys() drops duplicate paths, keeping their order
+            for path in dict.fromkeys(get_paths(obj)):
+                index.setdefault((sys.intern(obj.owner), path), []).append(obj)
+        return index
+
+    @staticmethod
+    def _index_by_owner(objects) -> Dict[str, List]:
+        index: Dict[str, List] = {}
+        for obj in objects:
+            index.setdefault(sys.intern(obj.owner), []).append(obj)
+        return index
+
     def _subst_alias(self, alias):
         if not alias[0] == '@':
             return alias
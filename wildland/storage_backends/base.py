@@ -32,7 +32,6 @@ import itertools
 import json
 import os
 import stat
-from dataclasses import dataclass
 from pathlib import PurePosixPath, Path
 from uuid import UUID
 from typing import Optional, Dict, Type, Any, List, Iterable, Tuple, Union, TYPE_CHECKING
@@ -77,15 +76,33 @@ class HashMismatchError(BaseException):
     """
 
 
-@dataclass
 class Attr:
     """
     File attributes. A subset of ``statinfo``.
+
+    Watchers keep one instance per file, so the class uses ``__slots__`` instead of a per-instance
+    ``__dict__`` (``@dataclass(slots=True)`` needs Python 3.10). Like a dataclass, it is mutable,
+    compared by value (and class), and not hashable.
     """
 
-    mode: int
-    size: int = 0
-    timestamp: int = 0
+    __slots__ = ('mode', 'size', 'timestamp')
+
+    def __init__(self, mode: int, size: int = 0, timestamp: int = 0):
+        self.mode = mode
+        self.size = size
+        self.timestamp = timestamp
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.mode, self.size, self.timestamp) == \
+            (other.mode, other.size, other.timestamp)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return f'{self.__class__.__qualname__}(mode={self.mode!r}, size={self.size!r}, ' \
+               f'timestamp={self.timestamp!r})'
 
     def is_dir(self) -> bool:
         """
@@ -218,7 +235,7 @@ class StorageBackend(metaclass=abc.ABCMeta):
     MOUNT_REFERENCE_CONTAINER = False
 
     _types: Dict[str, Type['StorageBackend']] = {}
-    _cache: Dict[str, 'StorageBackend'] = {}
+    _cache: Dict[Any, 'StorageBackend'] = {}
 
     def __init__(self, *,
                  params: Optional[Dict[str, Any]] = None,
@@ -548,6 +565,33 @@ class StorageBackend(metaclass=abc.ABCMeta):
         """
         raise OptionalError()
 
+    def readdir_attr(self, path: PurePosixPath) -> Iterable[Tuple[str, Optional[Attr]]]:
+        """
+        Return iterable of ``(name, attr)`` tuples for files living in the given directory.
+        ``attr`` is ``None`` if it is not available without an additional call to
+        :meth:`getattr`.
+
+        The default implementation returns ``None`` for every entry returned by
+        :meth:`readdir`, leaving it to the caller to decide how to call :meth:`getattr`;
+        backends that learn file attributes while listing a directory should override it.
+        """
+        for name in self.readdir(path):
+            yield name, None
+
+    def scandir(self, path: PurePosixPath) -> Iterable[Tuple[str, bool, Optional[Attr]]]:
+        """
+        Return iterable of ``(name, is_dir, attr)`` tuples for files living in the given
+        directory. ``attr`` may be ``None`` if it is not available without an additional call
+        to :meth:`getattr`.
+
+        The default implementation calls :meth:`getattr` for every entry returned by
+        :meth:`readdir`; backends that learn whether an entry is a directory while listing it
+        should override it.
+        """
+        for name in self.readdir(path):
+            attr = self.getattr(path / name)
+            yield name, attr.is_dir(), attr
+
     def truncate(self, path: PurePosixPath, length: int) -> None:
         """
         Truncate or extend the given file so that it is precisely ``length`` bytes long.
@@ -599,6 +643,22 @@ class StorageBackend(metaclass=abc.ABCMeta):
         """
         raise OptionalError()
 
+    # Whole-file operations, used by StorageDriver instead of open/read/write/release if available
+
+    def read_full(self, path: PurePosixPath) -> bytes:
+        """
+        Read the whole content of a file. Optional; backends that can fetch a file with fewer
+        round-trips than ``open`` + ``fgetattr`` + ``read`` + ``release`` should implement it.
+        """
+        raise OptionalError()
+
+    def write_full(self, path: PurePosixPath, data: bytes) -> None:
+        """
+        Replace the content of a file (creating it if needed) with ``data``. Optional, see
+        :meth:`read_full`.
+        """
+        raise OptionalError()
+
     # Other operations
 
     def get_file_token(self, path: PurePosixPath) -> Optional[str]:
@@ -671,12 +731,27 @@ class StorageBackend(metaclass=abc.ABCMeta):
         directory (or the whole storage if none given). Assumes the results will be given
         depth-first.
         """
-        for path in self.readdir(directory):
-            full_path = directory / path
+        stack = [(directory, iter(self.readdir(directory)))]
+        while stack:
+            dir_path, names = stack[-1]
+            name = next(names, None)
+            if name is None:
+                stack.pop()
+                continue
+            full_path = dir_path / name
             file_obj_atr = self.getattr(full_path)
             yield full_path, file_obj_atr
             if file_obj_atr.is_dir():
-                yield from self.walk(full_path)
+                stack.append((full_path, iter(self.readdir(full_path))))
+
+    @property
+    def supports_dir_mtime(self) -> bool:
+        """
+        Check if :meth:`getattr` of a directory reports a modification time (and size) that
+        changes whenever an entry is added to, removed from or renamed in that directory.
+        Watchers can then skip listing directories that have not changed.
+        """
+        return False
 
     @property
     def supports_publish(self) -> bool:
@@ -762,7 +837,7 @@ class StorageBackend(metaclass=abc.ABCMeta):
         """
 
         if deduplicate:
-            deduplicate_key = StorageBackend.generate_hash(params)
+            deduplicate_key = StorageBackend._deduplicate_key(params)
             if deduplicate_key in StorageBackend._cache:
                 return StorageBackend._cache[deduplicate_key]
 
@@ -780,6 +855,19 @@ class StorageBackend(metaclass=abc.ABCMeta):
             StorageBackend._cache[deduplicate_key] = backend
         return backend
 
+    @staticmethod
+    def _deduplicate_key(params: Dict[str, Any]) -> Any:
+        """
+        Key for the :meth:`from_params` cache. A frozen copy of params is much cheaper to compute
+        than :meth:`generate_hash`, which is used only if some of the values are not hashable.
+        """
+        try:
+            key = _freeze(params)
+            hash(key)
+        except TypeError:
+            return StorageBackend.generate_hash(params)
+        return key
+
     @staticmethod
     def is_type_supported(storage_type):
         """
@@ -813,12 +901,15 @@ class StorageBackend(metaclass=abc.ABCMeta):
         """
 
 
-def _inner_proxy(method_name):
-    def method(self, *args, **kwargs):
-        return getattr(self.inner, method_name)(*args, **kwargs)
-
-    method.__name__ = method_name
-    return method
+def _freeze(value):
+    """
+    Convert (possibly nested) params into a hashable form.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 
 def verify_local_access(path: Path, user: str, is_local_owner: bool):
@@ -25,6 +25,7 @@ StorageBackend mixin providing support for file-based Publishable Wildland Objec
 glob patterns and a file list).
 """
 
+import functools
 import re
 from pathlib import PurePosixPath
 from typing import List, Dict, Any, Iterable, Tuple, Optional, Iterator, Set
@@ -39,6 +40,15 @@ from wildland.storage_backends.base import StorageBackend
 from wildland.exc import WildlandError
 from wildland.storage_driver import StorageDriver
 from wildland.wildland_object.wildland_object import WildlandObject, PublishableWildlandObject
+from wildland.utils import parallel_map
+
+
+@functools.lru_cache(maxsize=256)
+def _glob_part_regex(part: str) -> re.Pattern:
+    """
+    Compile a single path part of a manifest pattern, where ``*`` is the only special character.
+    """
+    return re.compile(re.escape(part).replace(r'\*', '.*') + '$')
 
 
 class FileChildrenMixin(StorageBackend):
@@ -328,40 +338,94 @@ class FileChildrenMixin(StorageBackend):
 
     def _find_manifest_files(self, prefix: PurePosixPath, path: PurePosixPath) \
             -> Iterable[PurePosixPath]:
+        """
+        Find files under ``prefix`` matching ``path``, which may contain ``*`` and
+        ``{object-type}`` in its parts.
+
+        The pattern is matched one level at a time; directories needed at a given level are
+        listed only once, and concurrently if there is more than one of them. The same goes for
+        the getattr() calls checking the files at the end of non-glob patterns.
+        """
         assert len(path.parts) > 0, 'empty path'
 
-        part = path.parts[0]
-        sub_path = path.relative_to(part)
-        if '{object-type}' in part:
-            for object_type in WildlandObject.Type:
-                full_file_name = part.replace('{object-type}', object_type.value) / sub_path
-                yield from self._find_manifest_files(prefix, PurePosixPath(full_file_name))
-        elif '*' in part:
-            # This is a glob part, use readdir()
+        # plain string paths; PurePosixPath only for the backend calls and the results
+        def join(dir_path: str, name: str) -> str:
+            if dir_path == '.':
+                return name
+            return dir_path.rstrip('/') + '/' + name
+
+        # (directory, pattern parts still to match under it)
+        frontier: List[Tuple[str, Tuple[str, ...]]] = [(str(prefix), path.parts)]
+        while frontier:
+            candidates = []
+            for dir_path, parts in frontier:
+                if '{object-type}' in parts[0]:
+                    for object_type in WildlandObject.Type:
+                        candidates.append((
+                            dir_path,
+                            (parts[0].replace('{object-type}', object_type.value), *parts[1:])))
+                else:
+                    candidates.append((dir_path, parts))
+
+            listings = self._list_dirs(
+                list(dict.fromkeys(dir_path for dir_path, parts in candidates if '*' in parts[0])))
+
+            frontier = []
+            # (path, whether it still needs to be checked with getattr()), in order
+            found: List[Tuple[str, bool]] = []
+            for dir_path, parts in candidates:
+                part, sub_parts = parts[0], parts[1:]
+                if '*' in part:
+                    # This is a glob part, use readdir()
+                    names = listings[dir_path]
+                    if names is None:
+                        continue
+                    regex = _glob_part_regex(part)
+                    for name in names:
+                        if regex.match(name):
+                            if sub_parts:
+                                frontier.append((join(dir_path, name), sub_parts))
+                            else:
+                                found.append((join(dir_path, name), False))
+                elif sub_parts:
+                    # This is a normal part, go deeper
+                    frontier.append((join(dir_path, part), sub_parts))
+                else:
+                    # End of a normal path, check using getattr()
+                    found.append((join(dir_path, part), True))
+
+            existing = self._check_exist([path for path, check in found if check])
+            for path, check in found:
+                if not check or existing[path]:
+                    yield PurePosixPath(path)
+
+    def _list_dirs(self, dir_paths: List[str]) -> Dict[str, Optional[List[str]]]:
+        """
+        Call readdir() on all of the given directories. Directories that cannot be listed
+        are mapped to ``None``.
+        """
+
+        def list_dir(dir_path):
             try:
-                names = list(self.readdir(prefix))
+                return list(self.readdir(PurePosixPath(dir_path)))
             except IOError:
-                return
-            regex = re.compile('^' + part.replace('.', r'\.').replace('*', '.*') + '$')
-            for name in names:
-                if regex.match(name):
-                    sub_prefix = prefix / name
-                    if sub_path.parts:
-                        yield from self._find_manifest_files(sub_prefix, sub_path)
-                    else:
-                        yield sub_prefix
-        elif sub_path.parts:
-            # This is a normal part, recurse deeper
-            sub_prefix = prefix / part
-            yield from self._find_manifest_files(sub_prefix, sub_path)
-        else:
-            # End of a normal path, check using getattr()
-            full_path = prefix / part
+                return None
+
+        return dict(zip(dir_paths, parallel_map(list_dir, dir_paths)))
+
+    def _check_exist(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        Call getattr() on all of the given paths to check which of them exist.
+        """
+
+        def exists(path):
             try:
-                self.getattr(full_path)
+                self.getattr(PurePosixPath(path))
             except IOError:
-                return
-            yield full_path
+                return False
+            return True
+
+        return dict(zip(paths, parallel_map(exists, paths)))
 
     def _parse_glob_pattern(self, query_path: PurePosixPath) -> PurePosixPath:
         manifest_pattern = self.params.get('manifest-pattern', self.DEFAULT_MANIFEST_PATTERN)
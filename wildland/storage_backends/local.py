@@ -37,15 +37,17 @@ import inotify_simple
 
 from .base import StorageBackend, File, Attr, verify_local_access
 from .file_children import FileChildrenMixin
-from ..fs_utils import flags_to_mode
 from ..manifest.schema import Schema
-from .watch import StorageWatcher, FileEvent, FileEventType
+from .watch import StorageWatcher, SimpleFileWatcher, FileEvent, FileEventType
 from ..log import get_logger
 
 __all__ = ['LocalStorageBackend']
 
 logger = get_logger('local')
 
+#: size of a single pread() when reading a file up to EOF
+READ_ALL_CHUNK_SIZE = 1024 * 1024
+
 
 def to_attr(st: os.stat_result) -> Attr:
     """
@@ -71,51 +73,54 @@ class LocalFile(File):
         self.ignore_callback = ignore_callback
         self.changed = False
 
-        self.file = os.fdopen(
-            os.open(realpath, flags, mode),
-            flags_to_mode(flags))
-        self.lock = threading.Lock()
+        # A raw descriptor, used with pread()/pwrite(): every operation is a single syscall at an
+        # explicit offset, without a shared file position or a userspace buffer, so concurrent
+        # reads don't need a lock.
+        self.fd = os.open(realpath, flags, mode)
 
     # pylint: disable=missing-docstring
 
     def release(self, flags):
         if self.changed and self.ignore_callback:
             self.ignore_callback(FileEventType.MODIFY, self.path)
-        return self.file.close()
+        os.close(self.fd)
 
     def fgetattr(self) -> Attr:
         """...
 
         Without this method, at least :meth:`read` does not work.
         """
-        with self.lock:
-            st = to_attr(os.fstat(self.file.fileno()))
-            # Make sure to return the correct size.
-            # TODO: Unfortunately this is not enough, as fstat() causes FUSE to
-            # call getattr(), not fgetattr():
-            # https://github.com/libfuse/libfuse/issues/62
-            st.size = self.file.seek(0, 2)
-        return st
+        # Writes are not buffered, so fstat() reports the correct size.
+        # TODO: Unfortunately this is not enough, as fstat() causes FUSE to
+        # call getattr(), not fgetattr():
+        # https://github.com/libfuse/libfuse/issues/62
+        return to_attr(os.fstat(self.fd))
 
     def read(self, length: Optional[int]=None, offset: int=0) -> bytes:
-        with self.lock:
-            self.file.seek(offset)
-            return self.file.read(length)
+        if length is not None:
+            return os.pread(self.fd, length, offset)
+
+        # read up to EOF
+        chunks = []
+        while True:
+            chunk = os.pread(self.fd, READ_ALL_CHUNK_SIZE, offset)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+            offset += len(chunk)
 
     def write(self, data, offset):
-        with self.lock:
-            self.file.seek(offset)
-            written_data = self.file.write(data)
-            self.changed = True
-            return written_data
+        written_data = os.pwrite(self.fd, data, offset)
+        self.changed = True
+        return written_data
 
     def ftruncate(self, length):
-        with self.lock:
-            self.file.truncate(length)
-            self.changed = True
+        os.ftruncate(self.fd, length)
+        self.changed = True
 
     def flush(self) -> None:
-        self.file.flush()
+        # nothing is buffered
+        pass
 
 
 class LocalStorageBackend(FileChildrenMixin, StorageBackend):
@@ -146,6 +151,9 @@ class LocalStorageBackend(FileChildrenMixin, StorageBackend):
         if not location_path.is_dir():
             logger.info('LocalStorage root does not exist: %s', location_path)
         self.root = location_path
+        # _path() works on strings, to avoid building intermediate Path objects on every call
+        self._root_str = str(location_path)
+        self._root_prefix = os.path.join(self._root_str, '')
 
     @classmethod
     def cli_options(cls):
@@ -169,15 +177,15 @@ class LocalStorageBackend(FileChildrenMixin, StorageBackend):
         Returns:
             pathlib.Path: path relative to :attr:`self.root`
         """
-        ret = (self.root / path).resolve()
-        try:
-            ret.relative_to(self.root)
-        except ValueError as e:
+        # Not cached: a symlink may be replaced at any time, so it has to be resolved on every
+        # call for the check below to hold.
+        ret = os.path.realpath(os.path.join(self._root_str, path))
+        if ret != self._root_str and not ret.startswith(self._root_prefix):
             raise FileNotFoundError(
                 errno.EXDEV,
                 f'Treating [{path}] as an invalid symlink. Symlink are not allowed to point '
-                 'outside of the container.') from e
-        return ret
+                 'outside of the container.')
+        return Path(ret)
 
     # pylint: disable=missing-docstring
 
@@ -201,9 +209,52 @@ class LocalStorageBackend(FileChildrenMixin, StorageBackend):
     def getattr(self, path: PurePosixPath) -> Attr:
         return to_attr(os.lstat(self._path(path)))
 
+    def read_full(self, path: PurePosixPath) -> bytes:
+        with open(self._path(path), 'rb') as f:
+            return f.read()
+
+    def write_full(self, path: PurePosixPath, data: bytes) -> None:
+        realpath = self._path(path)
+        # same events and mode as create() and LocalFile.release() would give
+        if self.ignore_own_events and self.watcher_instance and not realpath.exists():
+            self.watcher_instance.ignore_event(FileEventType.CREATE, path)
+        fd = os.open(realpath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            if self.ignore_own_events and self.watcher_instance:
+                self.watcher_instance.ignore_event(FileEventType.MODIFY, path)
+            os.close(fd)
+
     def readdir(self, path: PurePosixPath) -> List[str]:
         return os.listdir(self._path(path))
 
+    def readdir_attr(self, path: PurePosixPath) -> Iterable[Tuple[str, Optional[Attr]]]:
+        # getattr() resolves symlinks (and refuses the ones pointing outside of the storage),
+        # so their attributes are left to it
+        with os.scandir(self._path(path)) as entries:
+            for entry in entries:
+                attr = None
+                if not entry.is_symlink():
+                    try:
+                        attr = to_attr(entry.stat(follow_symlinks=False))
+                    except OSError:
+                        pass
+                yield entry.name, attr
+
+    def scandir(self, path: PurePosixPath) -> Iterable[Tuple[str, bool, Optional[Attr]]]:
+        # is_dir() is answered from the directory listing, without a separate lstat(); symlinks
+        # go through getattr(), which resolves them the same way as for any other caller
+        with os.scandir(self._path(path)) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    attr = self.getattr(path / entry.name)
+                    yield entry.name, attr.is_dir(), attr
+                else:
+                    yield entry.name, entry.is_dir(follow_symlinks=False), None
+
     def truncate(self, path: PurePosixPath, length: int) -> None:
         os.truncate(self._path(path), length)
 
@@ -237,6 +288,10 @@ class LocalStorageBackend(FileChildrenMixin, StorageBackend):
 
         os.utime(self._path(path), ns=(atime_ns, mtime_ns))
 
+    @property
+    def supports_dir_mtime(self) -> bool:
+        return True
+
     def watcher(self):
         """
         If manifest explicitly specifies a watcher-interval, use default implementation. If not,
@@ -266,9 +321,14 @@ class LocalStorageWatcher(StorageWatcher):
     Watches for changes in local storage, using inotify.
     Known issues: on subdirectory creation, some events may be lost, because files appear
     before the watcher can add watches. It's unfortunately a known inotify issue.
+
+    If inotify watches cannot be set up because of the system limits (e.g.
+    ``fs.inotify.max_user_watches``), falls back to polling with SimpleFileWatcher.
     """
     def __init__(self, backend: StorageBackend):
         super().__init__()
+        self.backend = backend
+        self.fallback: Optional[SimpleFileWatcher] = None
         self.path = getattr(backend, 'root', None)
         self.clear_cache = backend.clear_cache
         self.watches: Dict[int, str] = {}
@@ -297,15 +357,42 @@ class LocalStorageWatcher(StorageWatcher):
 
     def init(self) -> None:
         # pylint: disable=attribute-defined-outside-init
-        self.inotify = inotify_simple.INotify()
-        self._watch_dir(self.path)
+        try:
+            self.inotify = inotify_simple.INotify()
+            self._watch_dir(self.path)
+        except OSError as e:
+            self._start_fallback(e)
+            return
         self._stop_pipe_read, self._stop_pipe_write = os.pipe()
 
+    def _start_fallback(self, error: OSError) -> None:
+        """
+        Switch to polling if ``error`` means the inotify limits were hit, re-raise it otherwise.
+        """
+        if error.errno not in (errno.ENOSPC, errno.EMFILE):
+            raise error
+        logger.warning('Cannot watch %s with inotify (%s), falling back to polling',
+                       self.path, error)
+        if hasattr(self, 'inotify'):
+            self.inotify.close()
+        self.fallback = SimpleFileWatcher(self.backend)
+        # share the stop event, so that the fallback's wait() returns on stop()
+        self.fallback.stop_event = self.stop_event
+        self.fallback.init()
+
     def stop(self):
-        os.write(self._stop_pipe_write, b's')
+        if not self.fallback:
+            os.write(self._stop_pipe_write, b's')
         super().stop()
 
     def shutdown(self) -> None:
+        if self.fallback:
+            self.fallback.shutdown()
+            if hasattr(self, '_stop_pipe_read'):
+                # switched to polling after inotify was set up
+                os.close(self._stop_pipe_write)
+                os.close(self._stop_pipe_read)
+            return
         try:
             os.close(self._stop_pipe_write)
             os.close(self._stop_pipe_read)
@@ -315,7 +402,30 @@ class LocalStorageWatcher(StorageWatcher):
         except Exception:
             logger.exception('Exception during local storage watcher shutdown:')
 
+    def _wait_fallback(self) -> Optional[Iterable[FileEvent]]:
+        with self.lock:
+            # events ignored before this scan started
+            pending = len(self.ignore_list)
+        events = self.fallback.wait() if self.fallback else None
+        with self.lock:
+            results = []
+            for event in events or []:
+                ev = (event.type, str(event.path))
+                if ev in self.ignore_list:
+                    i = self.ignore_list.index(ev)
+                    del self.ignore_list[i]
+                    if i < pending:
+                        pending -= 1
+                    continue
+                results.append(event)
+            # the scan has seen the changes behind the older entries, so those that did not
+            # match anything never will (e.g. a modification reported as part of a creation)
+            del self.ignore_list[:pending]
+        return results if events is not None else None
+
     def wait(self) -> Optional[Iterable[FileEvent]]:
+        if self.fallback:
+            return self._wait_fallback()
         result = select.select([self._stop_pipe_read, self.inotify], [], [])
         if self._stop_pipe_read in result[0]:
             return []
@@ -332,8 +442,11 @@ class LocalStorageWatcher(StorageWatcher):
 
             if inotify_simple.flags.CREATE in event_flags or \
                     inotify_simple.flags.MOVED_TO in event_flags:
-                if inotify_simple.flags.ISDIR in event_flags:
-                    self._watch_dir(path)
+                if inotify_simple.flags.ISDIR in event_flags and not self.fallback:
+                    try:
+                        self._watch_dir(path)
+                    except OSError as e:
+                        self._start_fallback(e)
                 event_type = FileEventType.CREATE
             elif inotify_simple.flags.DELETE in event_flags or \
                     inotify_simple.flags.MOVED_FROM in event_flags:
@@ -28,6 +28,9 @@ from .buffered import FullBufferedFile
 from ..manifest.manifest import Manifest
 from ..manifest.schema import Schema
 
+#: manifest fields that can be changed by editing a pseudomanifest
+_MODIFIABLE_FIELDS = frozenset({'paths', 'categories', 'title'})
+
 
 class PseudomanifestFile(FullBufferedFile):
     """
@@ -44,6 +47,7 @@ class PseudomanifestFile(FullBufferedFile):
             container_wl_path: str,
             data: bytearray,
             pseudomanifest_content: bytearray,
+            pseudomanifest: Manifest,
             error_message: bytearray,
             attr: Attr,
             release_callback: Callable[["PseudomanifestFile"], None]
@@ -54,6 +58,8 @@ class PseudomanifestFile(FullBufferedFile):
         self.container_wl_path = container_wl_path
         self.data = data
         self.pseudomanifest_content = pseudomanifest_content
+        #: parsed ``pseudomanifest_content``, which does not change during the file's lifetime
+        self.pseudomanifest = pseudomanifest
         self.error_message = error_message
         self.release_callback = release_callback
 
@@ -65,16 +71,19 @@ class PseudomanifestFile(FullBufferedFile):
         return self.data
 
     def write_full(self, data: bytes) -> int:
+        if data == self.data or data == self.pseudomanifest_content:
+            # rewritten without changes (possibly except for the error comments), which
+            # would be parsed into the same manifest and result in no modifications
+            return len(data)
+
         try:
-            new = Manifest.from_unsigned_bytes(bytes(data))
+            new = Manifest.from_unsigned_bytes(data)
             new.skip_verification()
-            old = Manifest.from_unsigned_bytes(bytes(self.pseudomanifest_content))
-            old.skip_verification()
         except Exception as e:
             self._update_error_message(data, str(e))
             raise IOError()  # pylint: disable=raise-missing-from
 
-        args = self._prepare_modify_cmd_args(data, new, old)
+        args = self._prepare_modify_cmd_args(data, new, self.pseudomanifest)
         if args:
             try:
                 _cli(self.base_dir, 'container', 'modify', self.container_wl_path, *args)
@@ -105,11 +114,10 @@ class PseudomanifestFile(FullBufferedFile):
                 new_title = "null"
             args += ("--title", new_title)
 
-        new_other_fields = {key: value for key, value in new.fields.items()
-                            if key not in ('paths', 'categories', 'title')}
-        old_other_fields = {key: value for key, value in old.fields.items()
-                            if key not in ('paths', 'categories', 'title')}
-        if new_other_fields != old_other_fields:
+        new_other_fields = new.fields.keys() - _MODIFIABLE_FIELDS
+        old_other_fields = old.fields.keys() - _MODIFIABLE_FIELDS
+        if new_other_fields != old_other_fields or \
+                any(new.fields[key] != old.fields[key] for key in new_other_fields):
             error_messages += "\n Pseudomanifest error: Modifying fields except:" \
                               "\n 'paths', 'categories', 'title' are not supported."
 
@@ -136,15 +144,15 @@ class PseudomanifestFile(FullBufferedFile):
         new_fields = new.fields[fields]
         old_fields = old.fields[fields]
 
+        # sets for membership tests, dict.fromkeys() to drop duplicates while keeping the order
         if mod == 'add':
-            to_modify = {f for f in new_fields if f not in old_fields}
+            old_set = set(old_fields)
+            to_modify = dict.fromkeys(f for f in new_fields if f not in old_set)
         elif mod == 'del':
-            to_modify = {f for f in old_fields if f not in new_fields}
-            try:
-                to_modify.remove(self.uuid_path)
+            new_set = set(new_fields)
+            to_modify = dict.fromkeys(f for f in old_fields if f not in new_set)
+            if self.uuid_path in to_modify:
                 raise ValueError("\n Pseudomanifest error: uuid path cannot be changed or removed.")
-            except KeyError:
-                pass
         else:
             raise ValueError()
 
@@ -152,20 +160,22 @@ class PseudomanifestFile(FullBufferedFile):
 
     def _update_error_message(self, data: bytes, error_messages: str):
         """Append error messages to the unchanged pseudomanifest"""
-        str_data = data.decode()
-        lines = str_data.splitlines()
-        without_comments = [line for line in lines if not line.startswith("#")]
-        data_without_comments = "\n".join(without_comments)
-
-        message = \
-            '\n\n# Changes to the following manifest' \
-            '\n# was rejected due to encountered errors:' \
-            '\n#\n# ' + data_without_comments.replace('\n', '\n# ') + \
-            '\n# ' + error_messages.replace('\n', '\n# ') + \
-            '\n'
+        # comment out every line in a single join, skipping the comments of the rejected data
+        commented_data = '\n# '.join(
+            line for line in data.decode().splitlines() if not line.startswith("#"))
+        commented_errors = '\n# '.join(error_messages.split('\n'))
+
+        message = ''.join((
+            '\n\n# Changes to the following manifest'
+            '\n# was rejected due to encountered errors:'
+            '\n#\n# ', commented_data,
+            '\n# ', commented_errors,
+            '\n'))
 
         self.error_message[:] = message.encode()
-        self.data[:] = self.pseudomanifest_content + self.error_message
+        # self.data always starts with the (unchanged) pseudomanifest content, so only the
+        # error message part needs to be replaced
+        self.data[len(self.pseudomanifest_content):] = self.error_message
         self.attr.size = len(self.data)
 
 
@@ -206,6 +216,7 @@ class PseudomanifestStorageBackend(StorageBackend):
         self.uuid_path = manifest.fields['paths'][0]
         self.container_wl_path = f"wildland:{manifest.fields['owner']}:{self.uuid_path}:"
         self.pseudomanifest_content = self.data.copy()
+        self.pseudomanifest = manifest
         self.error_message = bytearray(b"")
 
         self.attr = Attr(
@@ -226,6 +237,7 @@ class PseudomanifestStorageBackend(StorageBackend):
             self.container_wl_path,
             self.data,
             self.pseudomanifest_content,
+            self.pseudomanifest,
             self.error_message,
             self.attr,
             release_callback=self.open_files.remove
@@ -26,6 +26,7 @@ Timeline backend
 """
 
 import uuid
+from functools import lru_cache
 from typing import Tuple, Optional, Iterable
 from pathlib import PurePosixPath
 import errno
@@ -141,27 +142,34 @@ class TimelineStorageBackend(CachedStorageMixin, StorageBackend):
 
     @staticmethod
     def _date_str(timestamp: int) -> str:
-        d = datetime.date.fromtimestamp(timestamp)
-        return f'{d.year:04}/{d.month:02}/{d.day:02}'
+        # UTC offsets are multiples of 15 minutes, so a 15-minute bucket never spans a local
+        # midnight, and all timestamps in it map to the same date
+        return _bucket_date_str(timestamp // 900)
 
     def info_all(self) -> Iterable[Tuple[PurePosixPath, Attr]]:
-        yield from self._info_all_walk(PurePosixPath('.'))
-
-    def _info_all_walk(self, dir_path: PurePosixPath) -> \
-            Iterable[Tuple[PurePosixPath, Attr]]:
-
-        for name in self.inner.readdir(dir_path):
-            path = dir_path / name
-            attr = self.inner.getattr(path)
-            if attr.is_dir():
-                yield from self._info_all_walk(path)
-            else:
-                date_str = self._date_str(attr.timestamp)
-                # Duplicating the 'name' to create a separate directory for each
-                # file. This is necessary for the delegate backend to be able
-                # to access each of the files individually and prevents
-                # unneccessary file duplicates in the timeline tree.
-                yield date_str / path / PurePosixPath(name), attr
+        # depth-first, in the same order as a recursive walk
+        stack = [('.', iter(self.inner.scandir(PurePosixPath('.'))))]
+
+        while stack:
+            dir_path, entries = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            name, is_dir, attr = entry
+            path = name if dir_path == '.' else dir_path + '/' + name
+            if is_dir:
+                stack.append((path, iter(self.inner.scandir(PurePosixPath(path)))))
+                continue
+            if attr is None:
+                attr = self.inner.getattr(PurePosixPath(path))
+            date_str = self._date_str(attr.timestamp)
+            # Duplicating the 'name' to create a separate directory for each
+            # file. This is necessary for the delegate backend to be able
+            # to access each of the files individually and prevents
+            # unneccessary file duplicates in the timeline tree.
+            yield PurePosixPath(date_str + '/' + path + '/' + name), attr
 
     def open(self, path: PurePosixPath, flags: int) -> File:
         date_str, inner_path = self._split_path(path)
@@ -198,22 +206,24 @@ class TimelineStorageBackend(CachedStorageMixin, StorageBackend):
                 ref_categories = ref_container.categories
             else:
                 ref_categories = self.reference.get('categories', [])
+            ref_category_strs = [str(category) for category in ref_categories]
 
         for file, _ in self.info_all():
-            stub_categories = []
-            date = self._split_path(file)[0]
+            # only the date part of _split_path() is needed here
+            date = '/'.join(file.parts[:3])
             assert file.name is not None
             name = file.name
+            date_path = self.root + '/' + date
 
             if not paths_only:
-                for category in ref_categories:
-                    stub_categories.append(self.root + '/' + date + str(category))
+                stub_categories = [date_path + category for category in ref_category_strs]
+                ident = str(uuid.uuid3(ns, name))
 
-                yield PurePosixPath(self.root + '/' + date + '/' + name), \
+                yield PurePosixPath(date_path + '/' + name), \
                       ContainerStub({
                           'paths': [
-                              '/.uuid/{!s}'.format(uuid.uuid3(ns, name)),
-                              self.root + '/' + date,
+                              f'/.uuid/{ident}',
+                              date_path,
                           ],
                           'title': file.name,
                           'categories': stub_categories,
@@ -221,8 +231,14 @@ class TimelineStorageBackend(CachedStorageMixin, StorageBackend):
                               'type': 'delegate',
                               'reference-container': 'wildland:@default:@parent-container:',
                               'subdirectory': '/' + str(file.parent),
-                              'backend-id': str(uuid.uuid3(ns, name))
+                              'backend-id': ident
                           }]}
                       })
             else:
-                yield PurePosixPath(self.root + '/' + date + '/' + name), None
+                yield PurePosixPath(date_path + '/' + name), None
+
+
+@lru_cache(maxsize=4096)
+def _bucket_date_str(bucket: int) -> str:
+    d = datetime.date.fromtimestamp(bucket * 900)
+    return f'{d.year:04}/{d.month:02}/{d.day:02}'
@@ -25,15 +25,17 @@
 Watching for changes.
 """
 from enum import Enum
-from typing import Optional, List, Callable, Dict, Iterable
+from typing import Optional, List, Callable, Dict, Iterable, Tuple
 from pathlib import PurePosixPath
 import threading
 from dataclasses import dataclass
 import abc
 import os
+import time
 
 from .base import StorageBackend, Attr
 from ..log import get_logger
+from ..utils import parallel_map
 
 logger = get_logger('watch')
 
@@ -99,11 +101,48 @@ class StorageWatcher(metaclass=abc.ABCMeta):
         try:
             while not self.stop_event.is_set():
                 events = self.wait()
+                if events:
+                    events = self.coalesce(events)
                 if events:
                     self.handler(events)
         except Exception:
             logger.exception('error in watcher')
 
+    @staticmethod
+    def coalesce(events: Iterable[FileEvent]) -> List[FileEvent]:
+        """
+        Drop the events of a single batch that do not need to be handled separately: repeated
+        modifications of a file, and everything that happened to a file that was both created
+        and deleted within the batch (from its creation on). The order of the remaining events is
+        kept.
+        """
+        result: List[Optional[FileEvent]] = []
+        # path -> indices (in result) of its kept events
+        indices: Dict[PurePosixPath, List[int]] = {}
+        # path -> position of its CREATE event in indices[path]
+        created: Dict[PurePosixPath, int] = {}
+
+        for event in events:
+            path_indices = indices.setdefault(event.path, [])
+            if event.type == FileEventType.MODIFY:
+                last = result[path_indices[-1]] if path_indices else None
+                if last is not None and last.type == FileEventType.MODIFY:
+                    continue
+            elif event.type == FileEventType.CREATE:
+                created.setdefault(event.path, len(path_indices))
+            elif event.path in created:
+                # created and deleted again, nobody needs to know about it; whatever happened
+                # to the path before it was created still stands
+                start = created.pop(event.path)
+                for i in path_indices[start:]:
+                    result[i] = None
+                del path_indices[start:]
+                continue
+            path_indices.append(len(result))
+            result.append(event)
+
+        return [event for event in result if event is not None]
+
     def stop(self):
         """
         Stop the watching thread.
@@ -191,43 +230,117 @@ class SimpleStorageWatcher(StorageWatcher, metaclass=abc.ABCMeta):
 
     @staticmethod
     def _compare_info(current_info, new_info):
-        current_paths = set(current_info)
-        new_paths = set(new_info)
-        for path in current_paths - new_paths:
-            yield FileEvent(FileEventType.DELETE, path)
-        for path in new_paths - current_paths:
-            yield FileEvent(FileEventType.CREATE, path)
-        for path in current_paths & new_paths:
-            if current_info[path] != new_info[path]:
-                yield FileEvent(FileEventType.MODIFY, path)
+        # one lookup per path in the other dict, without building key sets; events are still
+        # reported as deletions, then creations, then modifications
+        modified = []
+        for path, info in current_info.items():
+            if path not in new_info:
+                yield FileEvent(FileEventType.DELETE, path)
+            elif new_info[path] != info:
+                modified.append(path)
+        for path in new_info:
+            if path not in current_info:
+                yield FileEvent(FileEventType.CREATE, path)
+        for path in modified:
+            yield FileEvent(FileEventType.MODIFY, path)
 
 
 class SimpleFileWatcher(SimpleStorageWatcher, metaclass=abc.ABCMeta):
     """
     An implementation of storage watcher that uses the backend to enumerate all files.
+
+    If the backend :attr:`~StorageBackend.supports_dir_mtime`, directory listings are
+    remembered together with the directory attributes, and a directory is listed again only
+    when its attributes change. Files are still checked with getattr() on every scan, because
+    modifying a file does not change its directory.
+
+    Freshly listed directories are read with :meth:`~StorageBackend.readdir_attr`, so backends
+    that return attributes together with the listing need no getattr() calls for them.
     """
 
-    def _get_info(self) -> Dict[PurePosixPath, Attr]:
-        return dict(self._walk(PurePosixPath('.')))
+    #: how old (in seconds) a directory timestamp must be for its listing to be remembered;
+    #: changes made in the same second as the listing would not change the (whole-second)
+    #: timestamp, so such a listing could go stale unnoticed
+    LISTING_MIN_AGE = 2
 
-    def _walk(self, dir_path: PurePosixPath):
+    def __init__(self, backend: StorageBackend, interval: int = 10):
+        super().__init__(backend, interval)
+        #: directory -> (its attributes, names in it) as seen during the last scan
+        self.listings: Dict[PurePosixPath, Tuple[Attr, List[str]]] = {}
+
+    def _get_info(self) -> Dict[PurePosixPath, Attr]:
+        root = PurePosixPath('.')
+        root_attr = None
+        if self.backend.supports_dir_mtime:
+            root_attr = self._getattr(root)
+
+        info: Dict[PurePosixPath, Attr] = {}
+        listings: Dict[PurePosixPath, Tuple[Attr, List[str]]] = {}
+
+        # The tree is scanned one level at a time, so that the readdir() and getattr() calls of
+        # a level can run concurrently; for remote backends, they are mostly waiting for I/O.
+        level: List[Tuple[PurePosixPath, Optional[Attr]]] = [(root, root_attr)]
+        while level:
+            children: List[PurePosixPath] = []
+            child_attrs: List[Optional[Attr]] = []
+            for (dir_path, dir_attr), (entries, remember) in \
+                    zip(level, parallel_map(lambda d: self._list_dir(*d), level)):
+                if entries is None:
+                    continue
+                if remember:
+                    assert dir_attr is not None
+                    listings[dir_path] = (dir_attr, [name for name, _ in entries])
+                for name, attr in entries:
+                    children.append(dir_path / name)
+                    child_attrs.append(attr)
+
+            # attributes not returned with the listing are fetched separately
+            missing = [i for i, attr in enumerate(child_attrs) if attr is None]
+            missing_attrs = parallel_map(self._getattr, [children[i] for i in missing])
+            for i, attr in zip(missing, missing_attrs):
+                child_attrs[i] = attr
+
+            level = []
+            for path, attr in zip(children, child_attrs):
+                if attr is None:
+                    continue
+                info[path] = attr
+                if attr.is_dir():
+                    level.append((path, attr))
+
+        self.listings = listings
+        return info
+
+    def _list_dir(self, dir_path: PurePosixPath, dir_attr: Optional[Attr]) \
+            -> Tuple[Optional[List[Tuple[str, Optional[Attr]]]], bool]:
+        """
+        List a directory, reusing the last listing if the directory did not change. Returns
+        the ``(name, attr)`` entries (``None`` on error) and whether the listing can be
+        remembered. ``attr`` is ``None`` when it has to be fetched with getattr(), which is
+        always the case for a reused listing.
+        """
+        if dir_attr is None or not self.backend.supports_dir_mtime:
+            dir_attr = None
+        else:
+            cached = self.listings.get(dir_path)
+            if cached is not None and cached[0] == dir_attr:
+                return [(name, None) for name in cached[1]], True
+
+        listed_at = time.time()
         try:
-            names = list(self.backend.readdir(dir_path))
+            entries = list(self.backend.readdir_attr(dir_path))
         except IOError:
             logger.exception('error in readdir %s', dir_path)
-            return
+            return None, False
+        return entries, dir_attr is not None and \
+            dir_attr.timestamp <= listed_at - self.LISTING_MIN_AGE
 
-        for name in names:
-            file_path = dir_path / name
-            try:
-                attr = self.backend.getattr(file_path)
-            except IOError:
-                logger.exception('error in getattr %s', file_path)
-                continue
-
-            yield file_path, attr
-            if attr.is_dir():
-                yield from self._walk(file_path)
+    def _getattr(self, path: PurePosixPath) -> Optional[Attr]:
+        try:
+            return self.backend.getattr(path)
+        except IOError:
+            logger.exception('error in getattr %s', path)
+            return None
 
 
 class SimpleSubcontainerWatcher(SimpleStorageWatcher, metaclass=abc.ABCMeta):
@@ -238,7 +351,7 @@ class SimpleSubcontainerWatcher(SimpleStorageWatcher, metaclass=abc.ABCMeta):
     def _get_info(self):
         to_return: Dict[PurePosixPath, Optional[float]] = {}
         paths = self.backend.get_children_paths()
-        logger.debug("watcher %s", str(self.backend))
+        logger.debug("watcher %s", self.backend)
         for path in paths:
             if os.path.exists(path):
                 mtime = os.path.getmtime(path)
@@ -27,6 +27,10 @@ Convenience module to directly access storage data.
 import errno
 import os
 from pathlib import PurePosixPath
+from typing import Iterator
+
+#: size of the chunks returned by StorageDriver.iter_read_file()
+READ_CHUNK_SIZE = 1024 * 1024
 
 
 class StorageDriver:
@@ -91,6 +95,13 @@ class StorageDriver:
         """
         Write a file to StorageBackend, using FUSE commands. Returns ``(StorageBackend, relpath)``.
         """
+        # OptionalError is a NotImplementedError; catching the latter avoids a circular import
+        try:
+            self.storage_backend.write_full(relpath, data)
+            return relpath
+        except NotImplementedError:
+            pass
+
         try:
             self.storage_backend.getattr(relpath)
         except FileNotFoundError:
@@ -133,27 +144,55 @@ class StorageDriver:
         Make directory, and it's parents if needed. Does not work across
         containers.
         """
-        for path in reversed((relpath, *relpath.parents)):
+        # Look for the deepest existing directory first, so that usually (when the parents
+        # exist) only a single getattr() is needed, then create the missing ones top-down.
+        missing = []
+        for path in (relpath, *relpath.parents):
             try:
                 attr = self.storage_backend.getattr(path)
             except FileNotFoundError:
-                # verify that we are not trying to create the '/' path
-                if path.is_absolute():
-                    path = path.relative_to('/')
-                self.storage_backend.mkdir(path, mode)
+                missing.append(path)
             else:
                 if not attr.is_dir():
                     raise NotADirectoryError(errno.ENOTDIR, path)
+                break
+
+        for path in reversed(missing):
+            # verify that we are not trying to create the '/' path
+            if path.is_absolute():
+                path = path.relative_to('/')
+            self.storage_backend.mkdir(path, mode)
 
     def read_file(self, relpath) -> bytes:
         """
         Read a file from StorageBackend, using FUSE commands.
         """
+        try:
+            return self.storage_backend.read_full(relpath)
+        except NotImplementedError:
+            pass
 
         obj = self.storage_backend.open(relpath, os.O_RDONLY)
         try:
-            st = self.storage_backend.fgetattr(relpath, obj)
-            return self.storage_backend.read(relpath, st.size, 0, obj)
+            # length=None reads up to EOF, no need for a separate fgetattr()
+            return self.storage_backend.read(relpath, None, 0, obj)
+        finally:
+            self.storage_backend.release(relpath, 0, obj)
+
+    def iter_read_file(self, relpath, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Read a file from StorageBackend in chunks of at most ``chunk_size`` bytes, so that a large
+        file does not have to be held in memory as a whole.
+        """
+        obj = self.storage_backend.open(relpath, os.O_RDONLY)
+        try:
+            offset = 0
+            while True:
+                data = self.storage_backend.read(relpath, chunk_size, offset, obj)
+                if not data:
+                    break
+                yield data
+                offset += len(data)
         finally:
             self.storage_backend.release(relpath, 0, obj)
 
@@ -273,12 +273,12 @@ class TestControlClient:
             raise self.results[name]
         return self.results[name]
 
-    def iter_events(self):
+    def iter_event_batches(self):
         while self.events:
             event = self.events.pop(0)
             if isinstance(event, BaseException):
                 raise event
-            yield event
+            yield [event]
 
     def expect(self, name: str, result=None) -> None:
         """
@@ -22,9 +22,11 @@
 
 # pylint: disable=missing-docstring,redefined-outer-name,unused-argument
 
+import errno
 import os
 import io
 import sqlite3
+import threading
 import time
 from typing import Callable, Dict, Iterable, List, Set, Tuple
 from pathlib import PurePosixPath, Path
@@ -33,11 +35,12 @@ from dataclasses import dataclass
 
 import pytest
 
-from ..storage_backends.local import LocalStorageBackend
+from ..storage_backends.local import LocalStorageBackend, LocalStorageWatcher
 from ..storage_backends.local_cached import LocalCachedStorageBackend, \
     LocalDirectoryCachedStorageBackend
 from ..storage_backends.base import StorageBackend, verify_local_access, OptionalError
-from ..storage_backends.watch import FileEvent, FileEventType
+from ..storage_backends.watch import FileEvent, FileEventType, SimpleFileWatcher, StorageWatcher
+from ..storage_driver import StorageDriver
 
 
 @pytest.fixture(params=[LocalStorageBackend, LocalCachedStorageBackend,
@@ -64,6 +67,42 @@ def cleanup():
         f()
 
 
+class ReceivedEvents(list):
+    """
+    A list of events received by a watcher handler, which can be waited for.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cond = threading.Condition()
+
+    def handler(self, events: List[FileEvent]):
+        with self.cond:
+            self.extend(events)
+            self.cond.notify_all()
+
+    def wait_for(self, count: int = 1, timeout: float = 2):
+        """
+        Wait until at least ``count`` events are received (or the timeout passes).
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: len(self) >= count, timeout)
+
+    def wait_until_quiet(self, quiet: float = 1, timeout: float = 2):
+        """
+        Wait for the first new event (or until the timeout passes), then until no more events
+        arrive for ``quiet`` seconds, so that trailing events are not left for the next step.
+        """
+        with self.cond:
+            count = len(self)
+            if not self.cond.wait_for(lambda: len(self) > count, timeout):
+                return
+            while True:
+                count = len(self)
+                if not self.cond.wait_for(lambda: len(self) > count, quiet):
+                    return
+
+
 def make_storage(location, backend_class) -> Tuple[StorageBackend, Path]:
     storage_dir = location / 'storage1'
     os.mkdir(storage_dir)
@@ -102,21 +141,22 @@ def test_simple_operations(tmpdir, storage_backend):
 def test_watcher_not_ignore_own(tmpdir, storage_backend, cleanup):
     backend, _ = make_storage(tmpdir, storage_backend)
 
-    received_events: List[FileEvent] = []
+    received_events = ReceivedEvents()
 
-    backend.start_watcher(handler=received_events.extend, ignore_own_events=False)
+    backend.start_watcher(handler=received_events.handler, ignore_own_events=False)
     cleanup(backend.stop_watcher)
 
     backend.mkdir(PurePosixPath('newdir'))
 
-    time.sleep(1)
+    received_events.wait_for()
     assert received_events == [FileEvent(FileEventType.CREATE, PurePosixPath('newdir'))]
     received_events.clear()
 
     with backend.create(PurePosixPath('newdir/testfile'), flags=os.O_CREAT):
         pass
 
-    time.sleep(1)
+    # a modify event may follow the create one, it must not leak into the next step
+    received_events.wait_until_quiet()
     # either create or create and modify are correct
     assert received_events in [
         [FileEvent(FileEventType.CREATE, PurePosixPath('newdir/testfile'))],
@@ -128,28 +168,137 @@ def test_watcher_not_ignore_own(tmpdir, storage_backend, cleanup):
     with backend.open(PurePosixPath('newdir/testfile'), os.O_RDWR) as file:
         file.write(b'bbbb', 0)
 
-    time.sleep(1)
+    received_events.wait_for()
     assert received_events == [FileEvent(FileEventType.MODIFY, PurePosixPath('newdir/testfile'))]
     received_events.clear()
 
     backend.unlink(PurePosixPath('newdir/testfile'))
 
-    time.sleep(1)
+    received_events.wait_for()
     assert received_events == [FileEvent(FileEventType.DELETE, PurePosixPath('newdir/testfile'))]
     received_events.clear()
 
     backend.rmdir(PurePosixPath('newdir'))
 
-    time.sleep(1)
+    received_events.wait_for()
     assert received_events == [FileEvent(FileEventType.DELETE, PurePosixPath('newdir'))]
 
 
+def test_watcher_inotify_fallback(tmpdir, cleanup):
+    backend, storage_dir = make_storage(tmpdir, LocalStorageBackend)
+    os.mkdir(storage_dir / 'dir1')
+
+    received_events: List[FileEvent] = []
+
+    with patch('inotify_simple.INotify.add_watch',
+               side_effect=OSError(errno.ENOSPC, 'No space left on device')):
+        watcher = backend.start_watcher(handler=received_events.extend)
+    cleanup(backend.stop_watcher)
+
+    assert watcher.fallback is not None
+    assert PurePosixPath('dir1') in watcher.fallback.info
+
+    # stopping must not wait for the polling interval
+    start = time.time()
+    backend.stop_watcher()
+    assert time.time() - start < 5
+
+
+def test_watcher_inotify_fallback_ignore_own(tmpdir):
+    backend, storage_dir = make_storage(tmpdir, LocalStorageBackend)
+
+    watcher = LocalStorageWatcher(backend)
+    with patch('inotify_simple.INotify.add_watch',
+               side_effect=OSError(errno.ENOSPC, 'No space left on device')):
+        watcher.init()
+    assert watcher.fallback is not None
+    watcher.fallback.interval = 0
+
+    watcher.ignore_event(FileEventType.CREATE, PurePosixPath('file1'))
+    watcher.ignore_event(FileEventType.MODIFY, PurePosixPath('file1'))
+    open(storage_dir / 'file1', 'a').close()
+    open(storage_dir / 'file2', 'a').close()
+
+    assert watcher.wait() == [FileEvent(FileEventType.CREATE, PurePosixPath('file2'))]
+    # the unmatched modify was reported as part of the creation, it is not kept forever
+    assert watcher.ignore_list == []
+    watcher.shutdown()
+
+
+def test_watcher_inotify_fallback_new_dir(tmpdir):
+    backend, storage_dir = make_storage(tmpdir, LocalStorageBackend)
+
+    watcher = LocalStorageWatcher(backend)
+    watcher.init()
+    assert watcher.fallback is None
+
+    with patch('inotify_simple.INotify.add_watch',
+               side_effect=OSError(errno.ENOSPC, 'No space left on device')):
+        os.mkdir(storage_dir / 'dir1')
+        assert watcher.wait() == [FileEvent(FileEventType.CREATE, PurePosixPath('dir1'))]
+    assert watcher.fallback is not None
+    assert PurePosixPath('dir1') in watcher.fallback.info
+    watcher.shutdown()
+
+
+def test_watcher_coalesce():
+    create, modify, delete = FileEventType.CREATE, FileEventType.MODIFY, FileEventType.DELETE
+
+    def events(*pairs):
+        return [FileEvent(event_type, PurePosixPath(path)) for event_type, path in pairs]
+
+    assert StorageWatcher.coalesce(events(
+        (create, 'a'), (modify, 'a'), (modify, 'b'), (modify, 'a'), (modify, 'b'))) == \
+        events((create, 'a'), (modify, 'a'), (modify, 'b'))
+    assert StorageWatcher.coalesce(events(
+        (create, 'tmp'), (modify, 'tmp'), (create, 'a'), (delete, 'tmp'))) == \
+        events((create, 'a'))
+    assert StorageWatcher.coalesce(events(
+        (delete, 'a'), (create, 'a'), (modify, 'a'))) == \
+        events((delete, 'a'), (create, 'a'), (modify, 'a'))
+    assert StorageWatcher.coalesce(events(
+        (delete, 'a'), (create, 'a'), (delete, 'a'))) == \
+        events((delete, 'a'))
+    assert StorageWatcher.coalesce(events(
+        (modify, 'a'), (delete, 'a'), (create, 'a'), (modify, 'a'), (delete, 'a'))) == \
+        events((modify, 'a'), (delete, 'a'))
+
+
+def test_simple_watcher_reuses_listings(tmpdir):
+    backend, storage_dir = make_storage(tmpdir, LocalStorageBackend)
+    os.mkdir(storage_dir / 'dir1')
+    open(storage_dir / 'dir1/testfile1', 'a').close()
+    old = time.time() - 60
+    for path in [storage_dir, storage_dir / 'dir1']:
+        os.utime(path, (old, old))
+
+    watcher = SimpleFileWatcher(backend)
+    watcher.init()
+
+    with patch.object(backend, 'readdir_attr', wraps=backend.readdir_attr) as readdir:
+        assert watcher._get_info() == watcher.info  # pylint: disable=protected-access
+        readdir.assert_not_called()
+
+        # modified file is noticed without listing its directory
+        with open(storage_dir / 'dir1/testfile1', 'w') as f:
+            f.write('changed')
+        info = watcher._get_info()  # pylint: disable=protected-access
+        readdir.assert_not_called()
+        assert info[PurePosixPath('dir1/testfile1')].size == 7
+
+        # new file changes the directory, which is listed again
+        open(storage_dir / 'dir1/testfile2', 'a').close()
+        info = watcher._get_info()  # pylint: disable=protected-access
+        readdir.assert_called_once_with(PurePosixPath('dir1'))
+        assert PurePosixPath('dir1/testfile2') in info
+
+
 def test_watcher_ignore_own(tmpdir, storage_backend, cleanup):
     backend, _ = make_storage(tmpdir, storage_backend)
 
-    received_events: List[FileEvent] = []
+    received_events = ReceivedEvents()
 
-    watcher = backend.start_watcher(handler=received_events.extend, ignore_own_events=True)
+    watcher = backend.start_watcher(handler=received_events.handler, ignore_own_events=True)
     cleanup(backend.stop_watcher)
 
     backend.mkdir(PurePosixPath('newdir'))
@@ -163,6 +312,7 @@ def test_watcher_ignore_own(tmpdir, storage_backend, cleanup):
     backend.unlink(PurePosixPath('newdir/testfile'))
     backend.rmdir(PurePosixPath('newdir'))
 
+    # waiting for events that should not come
     time.sleep(1)
 
     # we can allow one superfluous modify event, if file creation was parsed as two events and not
@@ -177,7 +327,7 @@ def test_watcher_ignore_own(tmpdir, storage_backend, cleanup):
     # perform some external operations
     os.mkdir(tmpdir / 'storage1/anotherdir')
 
-    time.sleep(1)
+    received_events.wait_for()
 
     assert received_events == [FileEvent(FileEventType.CREATE, PurePosixPath('anotherdir'))]
 
@@ -195,9 +345,8 @@ def test_hashing_short(tmpdir, storage_backend):
 def test_hashing_long(tmpdir, storage_backend):
     backend, storage_dir = make_storage(tmpdir, storage_backend)
 
-    with open(storage_dir / 'testfile', mode='w') as f:
-        for _ in range(1024 ** 2):
-            f.write('aaaa')
+    with open(storage_dir / 'testfile', mode='wb') as f:
+        f.write(b'a' * (4 * 1024 ** 2))
 
     assert backend.get_hash(PurePosixPath("testfile")) == \
            '299285fc41a44cdb038b9fdaf494c76ca9d0c866672b2b266c1a0c17dda60a05'
@@ -309,6 +458,121 @@ def test_walk(tmpdir, storage_backend):
     assert sorted(received_files) == sorted(expected_files)
 
 
+def test_scandir(tmpdir, storage_backend):
+    backend, storage_dir = make_storage(tmpdir, storage_backend)
+
+    os.mkdir(storage_dir / 'dir1')
+    os.mkdir(storage_dir / 'dir1/subdir1')
+    open(storage_dir / 'testfile1', 'a').close()
+    open(storage_dir / 'dir1/testfile2', 'a').close()
+
+    def entries(path):
+        result = []
+        for name, is_dir, attr in backend.scandir(PurePosixPath(path)):
+            if attr is not None:
+                assert attr.is_dir() == is_dir
+            result.append((name, is_dir))
+        return sorted(result)
+
+    assert entries('.') == [('dir1', True), ('testfile1', False)]
+    assert entries('dir1') == [('subdir1', True), ('testfile2', False)]
+    assert entries('dir1/subdir1') == []
+
+
+def test_local_scandir_symlink(tmpdir):
+    backend, storage_dir = make_storage(tmpdir, LocalStorageBackend)
+
+    os.mkdir(storage_dir / 'dir1')
+    os.symlink('dir1', storage_dir / 'link1')
+
+    # same answer as getattr(), which resolves the symlink
+    entries = {name: is_dir for name, is_dir, _ in backend.scandir(PurePosixPath('.'))}
+    assert entries == {'dir1': True, 'link1': True}
+    assert backend.getattr(PurePosixPath('link1')).is_dir()
+
+
+def test_readdir_attr(tmpdir, storage_backend):
+    backend, storage_dir = make_storage(tmpdir, storage_backend)
+
+    os.mkdir(storage_dir / 'dir1')
+    with open(storage_dir / 'testfile1', 'w') as f:
+        f.write('abc')
+
+    entries = dict(backend.readdir_attr(PurePosixPath('.')))
+    assert sorted(entries) == ['dir1', 'testfile1']
+    for name, attr in entries.items():
+        if attr is not None:
+            assert attr == backend.getattr(PurePosixPath(name))
+
+
+def test_find_manifest_files(tmpdir):
+    storage_dir = tmpdir / 'storage1'
+    os.mkdir(storage_dir)
+    backend = LocalStorageBackend(params={
+        'location': str(storage_dir),
+        'type': 'local',
+        'backend-id': 'test_id',
+        'manifest-pattern': {'type': 'glob', 'path': '/*/manifests/*.{object-type}.yaml'},
+    })
+
+    for dir_name in ('dir1', 'dir2', 'dir3'):
+        os.makedirs(storage_dir / dir_name / 'manifests')
+    os.mkdir(storage_dir / 'dir4')
+    open(storage_dir / 'dir1/manifests/c1.container.yaml', 'a').close()
+    open(storage_dir / 'dir1/manifests/b1.bridge.yaml', 'a').close()
+    open(storage_dir / 'dir1/manifests/other.yaml', 'a').close()
+    open(storage_dir / 'dir3/manifests/c3.container.yaml', 'a').close()
+    open(storage_dir / 'c0.container.yaml', 'a').close()
+
+    received_files = [str(path) for path, _ in backend.get_children(paths_only=True)]
+
+    assert sorted(received_files) == [
+        'dir1/manifests/b1.bridge.yaml',
+        'dir1/manifests/c1.container.yaml',
+        'dir3/manifests/c3.container.yaml',
+    ]
+
+
+def test_find_manifest_files_literal_chars(tmpdir):
+    storage_dir = tmpdir / 'storage1'
+    os.mkdir(storage_dir)
+    backend = LocalStorageBackend(params={
+        'location': str(storage_dir),
+        'type': 'local',
+        'backend-id': 'test_id',
+        'manifest-pattern': {'type': 'glob', 'path': '/m+(*).{object-type}.yaml'},
+    })
+
+    open(storage_dir / 'm+(1).container.yaml', 'a').close()
+    # would match if '+' and '(' were treated as regex syntax
+    open(storage_dir / 'mm1.container.yaml', 'a').close()
+
+    received_files = [str(path) for path, _ in backend.get_children(paths_only=True)]
+
+    assert received_files == ['m+(1).container.yaml']
+
+
+def test_storage_driver_read_write(tmpdir, storage_backend):
+    backend, storage_dir = make_storage(tmpdir, storage_backend)
+    driver = StorageDriver(backend)
+
+    old_umask = os.umask(0)
+    try:
+        driver.write_file(PurePosixPath('file'), b'first version')
+    finally:
+        os.umask(old_umask)
+    assert (storage_dir / 'file').read_binary() == b'first version'
+    assert os.stat(storage_dir / 'file').st_mode & 0o777 == 0o644
+    assert driver.read_file(PurePosixPath('file')) == b'first version'
+
+    # overwriting truncates the old content
+    driver.write_file(PurePosixPath('file'), b'second')
+    assert driver.read_file(PurePosixPath('file')) == b'second'
+
+    with pytest.raises(FileNotFoundError):
+        driver.read_file(PurePosixPath('missing'))
+
+
 def test_local_access(tmp_path):
     # local-owner
     verify_local_access(tmp_path, '0xaaaa', True)
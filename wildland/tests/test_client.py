@@ -23,7 +23,8 @@
 # pylint: disable=missing-docstring,redefined-outer-name,protected-access
 
 import tempfile
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from unittest import mock
 
 import pytest
 
@@ -160,3 +161,38 @@ def test_unquote_local_path(client, owner):
     local_url = 'file:///Users/Jan%20Kowalski/whatever'
     path = client.parse_file_url(local_url, owner)
     assert str(path) == '/Users/Jan Kowalski/whatever'
+
+
+def test_get_local_containers_cache(client, owner):
+    container = Container(owner=owner, paths=[PurePosixPath('/path1')], backends=[], client=client)
+    client.save_new_object(WildlandObject.Type.CONTAINER, container, "container")
+
+    containers = client.get_local_containers()
+    assert [c.paths[1:] for c in containers] == [[PurePosixPath('/path1')]]
+    # unchanged manifest is not loaded again, but the caller gets its own copy
+    with mock.patch.object(client, 'load_object_from_file_path') as load:
+        reloaded = client.get_local_containers()
+        load.assert_not_called()
+    assert reloaded[0] is not containers[0]
+    containers[0].paths.append(PurePosixPath('/modified'))
+    assert reloaded[0].paths[1:] == [PurePosixPath('/path1')]
+
+    container.paths.append(PurePosixPath('/path2'))
+    client.save_object(WildlandObject.Type.CONTAINER, container)
+
+    containers = client.get_local_containers()
+    assert [c.paths[1:] for c in containers] == [
+        [PurePosixPath('/path1'), PurePosixPath('/path2')]]
+
+    # a key change invalidates the manifests verified before it
+    _, pubkey = client.session.sig.generate()
+    client.session.sig.add_pubkey(pubkey)
+    with mock.patch.object(client, 'load_object_from_file_path',
+                           wraps=client.load_object_from_file_path) as load:
+        client.get_local_containers()
+        load.assert_called_once()
+
+    # removed manifests are dropped from the cache as well
+    container.local_path.unlink()
+    assert client.get_local_containers() == []
+    assert client._local_containers_stats == {}
@@ -126,6 +126,7 @@ def test_expanded_paths(client, cli):
            == {str(p) for p in container.expanded_paths if 'uuid' not in str(p)}
 
     assert str(container.expanded_paths[0]) == f'/.uuid/{uuid}'
+    assert container.expanded_paths_set == frozenset(container.expanded_paths)
 
 
 def test_users_additional_pubkeys(cli, base_dir):
@@ -36,6 +36,7 @@ from ..control_client import ControlClient, ControlClientError
 
 class TestObj:
     # pylint: disable=no-self-use
+    handler = None
 
     @control_command('hello')
     def control_hello(self, handler):
@@ -54,6 +55,10 @@ class TestObj:
         handler.send_event('this is event')
         return 'this is result'
 
+    @control_command('subscribe')
+    def control_subscribe(self, handler):
+        self.handler = handler
+
 
 @pytest.fixture
 def temp_dir():
@@ -67,10 +72,14 @@ def socket_path(temp_dir):
 
 
 @pytest.fixture
-def server(socket_path):
+def test_obj():
+    return TestObj()
+
+
+@pytest.fixture
+def server(socket_path, test_obj):
     server = ControlServer()
-    test = TestObj()
-    server.register_commands(test)
+    server.register_commands(test_obj)
     server.start(socket_path)
     try:
         yield server
@@ -173,6 +182,25 @@ def test_control_client(client: ControlClient):
     assert client.wait_for_events() == ['this is event']
 
 
+def test_control_client_drain_events(client: ControlClient, test_obj):
+    client.run_command('subscribe')
+    test_obj.handler.send_event('event 1')
+    test_obj.handler.send_event('event 2')
+    test_obj.handler.send_event('event 3')
+
+    assert next(client.iter_event_batches()) == ['event 1', 'event 2', 'event 3']
+
+
+def test_control_client_single_events(client: ControlClient, test_obj):
+    client.run_command('subscribe')
+    test_obj.handler.send_event('event 1')
+    test_obj.handler.send_event('event 2')
+
+    # Events not taken from one iterator must not be lost for the next one
+    assert next(client.iter_events()) == 'event 1'
+    assert next(client.iter_events()) == 'event 2'
+
+
 def test_control_client_error(client: ControlClient):
     with pytest.raises(ControlClientError, match='ValueError: boom'):
         client.run_command('boom')
@@ -148,6 +148,7 @@ class RemounterWrapper(Remounter):
         self.call_counter = 0
         self.control_client = control_client
         self.init_mount_pending = False
+        self.debounce_interval = 0
 
     def expect_action(self, to_mount, to_unmount, callback):
         """
@@ -231,7 +232,7 @@ class RemounterWrapper(Remounter):
             f'expected {to_unmount_with_nons}, actual {self.to_unmount}'
         for storage_id in to_unmount:
             self.control_client.del_storage(storage_id)
-        self.to_unmount.clear()
+        del self.to_unmount[:]
 
         self.fs_client.clear_cache()
 
@@ -652,7 +653,7 @@ class SearchMock:
 @pytest.fixture
 def search_mock():
     test_search = SearchMock()
-    with mock.patch('wildland.remounter.Search') as search_mock:
+    with mock.patch('wildland.search.Search') as search_mock:
         search_mock.return_value = test_search
         yield test_search
 
@@ -1063,7 +1064,7 @@ def test_failed_mount(remounter_type, control_client, client):
     del control_client.results['paths']
     remounter = Remounter(client, client.fs_client, [])
 
-    remounter.to_mount.append((mock.Mock, [], [], None))
+    remounter.to_mount.append((mock.Mock(), [], [], None))
     control_client.expect('mount', ControlClientError('mount failed'))
     # should catch the mount error
     remounter.mount_pending()
@@ -1071,6 +1072,24 @@ def test_failed_mount(remounter_type, control_client, client):
     assert remounter.to_mount == []
 
 
+def test_mount_pending_dedup(remounter_type, control_client, client):
+    del control_client.results['info']
+    del control_client.results['paths']
+    remounter = Remounter(client, client.fs_client, [])
+
+    container = mock.Mock()
+    other_container = mock.Mock()
+    first = (container, [], [], None)
+    last = (container, [mock.Mock()], [], None)
+    other = (other_container, [], [], None)
+    remounter.to_mount.extend([first, other, last])
+    with mock.patch.object(client.fs_client, 'mount_multiple_containers') as mount:
+        remounter.mount_pending()
+    # the container queued twice is mounted once, using the last entry
+    mount.assert_called_once_with([last, other], remount=True)
+    assert remounter.to_mount == []
+
+
 def test_failed_unmount(remounter_type, control_client, client):
     del control_client.results['info']
     del control_client.results['paths']
@@ -1082,13 +1101,33 @@ def test_failed_unmount(remounter_type, control_client, client):
     # should catch the unmount error
     remounter.unmount_pending()
     # don't retry exactly the same operation
-    assert remounter.to_unmount == []
+    assert not remounter.to_unmount
 
     assert control_client.all_calls['unmount'] == [
         {'storage_id': 1},
         {'storage_id': 2},
     ]
 
+
+def test_unmount_storages_errors(control_client, client):
+    del control_client.results['info']
+    del control_client.results['paths']
+    error = ControlClientError('unmount failed')
+
+    def run_command(name, storage_id):
+        assert name == 'unmount'
+        if storage_id == 2:
+            raise error
+
+    with mock.patch.object(control_client, 'connect') as connect, \
+            mock.patch.object(control_client, 'run_command', side_effect=run_command) as run:
+        errors = client.fs_client.unmount_storages([1, 2, 3])
+
+    # one connection; the failed unmount does not stop the next one
+    connect.assert_called_once()
+    assert [call.kwargs['storage_id'] for call in run.call_args_list] == [1, 2, 3]
+    assert errors == {2: error}
+
 # TODO:
 #  - container that fails to mount
 #  (it's rather a test for mount_multiple_containers? or even fs_base.py)
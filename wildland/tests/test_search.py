@@ -192,7 +192,7 @@ def test_resolve_first(base_dir, client):
     # pylint: disable=protected-access
     search = Search(client, WildlandPath.from_str(':/path:'),
                     aliases={'default': '0xaaa'})
-    step = list(search._resolve_first())[0]
+    step = list(search._resolve_first({}))[0]
     assert step.container.paths[1] == PurePosixPath('/path')
 
     _, backend = search._find_storage(step)
@@ -201,7 +201,7 @@ def test_resolve_first(base_dir, client):
 
     search = Search(client, WildlandPath.from_str(':/path/subpath:'),
                     aliases={'default': '0xaaa'})
-    step = list(search._resolve_first())[0]
+    step = list(search._resolve_first({}))[0]
     assert step.container.paths[1] == PurePosixPath('/path/subpath')
 
     _, backend = search._find_storage(step)
@@ -218,6 +218,19 @@ def test_read_file(base_dir, client):
     assert data == b'Hello world'
 
 
+def test_iter_read_file(base_dir, client):
+    with open(base_dir / 'storage1/file.txt', 'w') as f:
+        f.write('Hello world')
+    search = Search(client, WildlandPath.from_str(':/path:/file.txt'),
+                    aliases={'default': '0xaaa'})
+    assert b''.join(search.iter_read_file()) == b'Hello world'
+
+    search = Search(client, WildlandPath.from_str(':/path:/missing.txt'),
+                    aliases={'default': '0xaaa'})
+    with pytest.raises(FileNotFoundError):
+        list(search.iter_read_file())
+
+
 def test_write_file(base_dir, client):
     search = Search(client, WildlandPath.from_str(':/path:/file.txt'),
                     aliases={'default': '0xaaa'})
@@ -245,6 +258,38 @@ def test_read_container_traverse(client):
     assert PurePosixPath('/other/path') in container.paths
 
 
+def test_read_container_traverse_mount(client):
+    # pylint: disable=protected-access
+    search = Search(client, WildlandPath.from_str(':/path:/other/path:'),
+                    aliases={'default': '0xaaa'})
+    with mock.patch.object(LocalStorageBackend, 'mount', autospec=True) as mount, \
+            mock.patch.object(LocalStorageBackend, 'unmount', autospec=True) as unmount:
+        steps = list(search.resolve_raw())
+        assert len(steps) == 1
+
+        # the same backend is mounted only once per resolution
+        _, backend = search._find_storage(steps[0].previous)
+        mounted = {}
+        search._mount(backend, mounted)
+        search._mount(backend, mounted)
+        assert backend.mounted == 1
+        search._unmount_all(mounted)
+
+        # a resolution finishing does not unmount backends still used by another one
+        # (a new Search, so that nothing is resolved from the cache of the previous one)
+        search = Search(client, WildlandPath.from_str(':/path:/other/path:'),
+                        aliases={'default': '0xaaa'})
+        resolution = search.resolve_raw()
+        next(resolution)
+        assert backend.mounted == 1
+        assert len(list(search.resolve_raw())) == 1
+        assert backend.mounted == 1
+        resolution.close()
+
+    assert mount.call_count == unmount.call_count == 3
+    assert backend.mounted == 0
+
+
 def test_read_container_local_wildcard(client):
     search = Search(client, WildlandPath.from_str(':*:'),
                     aliases={'default': '0xaaa'})
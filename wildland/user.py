@@ -34,6 +34,7 @@ from .manifest.manifest import Manifest, ManifestDecryptionKeyUnavailableError
 from .manifest.schema import Schema
 from .exc import WildlandError
 from .log import get_logger
+from .utils import parallel_map
 
 
 logger = get_logger('user')
@@ -81,6 +82,16 @@ class _CatalogCache:
                 raise WildlandError(f'Cannot load manifests catalog entry: {str(ex)}') from ex
         return self.cached_object
 
+    @property
+    def is_prefetchable(self) -> bool:
+        """
+        Whether the object is a file: or http(s): URL, which is fetched without touching any state
+        shared with other entries (unlike Wildland URLs and links, which mount storages), so it
+        can be loaded from a worker thread.
+        """
+        return isinstance(self.manifest, str) and \
+            self.manifest.startswith(('file:', 'http:', 'https:'))
+
     def __eq__(self, other):
         return self.manifest == other.manifest
 
@@ -186,10 +197,14 @@ class User(PublishableWildlandObject, obj_type=WildlandObject.Type.USER):
         undecryptable_containers = 0
         unknown_failure_containers = 0
 
+        prefetch_errors = self._prefetch_catalog()
+
         for cached_object in self._manifests_catalog:
             total_containers += 1
 
             try:
+                if id(cached_object) in prefetch_errors:
+                    raise prefetch_errors[id(cached_object)]
                 container = cached_object.get(self.client, self.owner)
             except ManifestDecryptionKeyUnavailableError as e:
                 undecryptable_containers += 1
@@ -213,6 +228,28 @@ class User(PublishableWildlandObject, obj_type=WildlandObject.Type.USER):
                            self.owner, total_failures, undecryptable_containers,
                            unknown_failure_containers)
 
+    def _prefetch_catalog(self) -> Dict[int, Exception]:
+        """
+        Load all not yet cached, prefetchable catalog entries concurrently, so that they are
+        cached when the caller gets to them. Returns the errors of the entries that failed to
+        load, keyed by id() of the catalog entry.
+        """
+        to_fetch = [cached_object for cached_object in self._manifests_catalog
+                    if not cached_object.cached_object and cached_object.is_prefetchable]
+        if len(to_fetch) < 2:
+            return {}
+
+        def fetch(cached_object) -> Optional[Exception]:
+            try:
+                cached_object.get(self.client, self.owner)
+            except (WildlandError, OSError) as e:
+                return e
+            return None
+
+        return {id(cached_object): error
+                for cached_object, error in zip(to_fetch, parallel_map(fetch, to_fetch))
+                if error is not None}
+
     def get_catalog_descriptions(self):
         """Provide a human-readable descriptions of user's manifests catalog without loading
         them."""
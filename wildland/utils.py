@@ -22,10 +22,15 @@
 """
 General Wildland utility functions.
 """
-from typing import Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar, Union
 
 import click
 import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
 
 
 class YAMLParserError(yaml.YAMLError):
@@ -34,7 +39,34 @@ class YAMLParserError(yaml.YAMLError):
     """
 
 
-class DisallowDuplicateKeyLoader(yaml.SafeLoader):
+if yaml.__with_libyaml__:
+    from yaml.cyaml import CParser
+
+    class _SafeLoader(CParser, Composer, SafeConstructor, Resolver):
+        """
+        Safe Yaml loader using libyaml for scanning and parsing.
+
+        Unlike :class:`yaml.CSafeLoader`, nodes are composed in Python, so the loaders below
+        can still hook into it (the C composer ignores the ``anchors`` attribute).
+        """
+
+        get_single_node = Composer.get_single_node
+        get_node = Composer.get_node
+        check_node = Composer.check_node
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+    _CSafeLoader = yaml.CSafeLoader
+else:
+    _SafeLoader = yaml.SafeLoader  # type: ignore
+    _CSafeLoader = yaml.SafeLoader  # type: ignore
+
+
+class DisallowDuplicateKeyLoader(_SafeLoader):
     """
     Alternate Yaml loader that raises error on duplicate keys.
     """
@@ -90,7 +122,7 @@ class YamlParser:
         Resolve only basic YAML tags. This is known
         to be safe for untrusted input.
         """
-        return yaml.safe_load(data)
+        return yaml.load(data, Loader=_CSafeLoader)
 
     @staticmethod
     def safe_load_all(data):
@@ -101,7 +133,7 @@ class YamlParser:
         Resolve only basic YAML tags. This is known
         to be safe for untrusted input.
         """
-        return yaml.safe_load_all(data)
+        return yaml.load_all(data, Loader=_CSafeLoader)
 
     @staticmethod
     def load(stream):
@@ -178,3 +210,41 @@ def format_multi_command_options(self, ctx: click.Context,
 
     format_options_required_first(self, ctx, formatter)
     self.format_commands(ctx, formatter)
+
+
+#: size of the thread pool shared by all :func:`parallel_map` calls
+PARALLEL_MAP_WORKERS = 16
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+_parallel_map_executor: Optional[ThreadPoolExecutor] = None
+_parallel_map_lock = threading.Lock()
+_parallel_map_local = threading.local()
+
+
+def _parallel_map_worker(func: Callable[[_T], _R], item: _T) -> _R:
+    _parallel_map_local.in_pool = True
+    return func(item)
+
+
+def parallel_map(func: Callable[[_T], _R], items: Sequence[_T]) -> List[_R]:
+    """
+    Return ``[func(item) for item in items]``, with the calls run concurrently on a thread pool
+    shared by all callers (meant for calls waiting for I/O, e.g. on remote storages). The first
+    exception raised by ``func`` is re-raised.
+
+    Runs the calls inline for fewer than two items, or when called from the pool itself, where
+    waiting for other pool tasks could deadlock.
+    """
+    global _parallel_map_executor  # pylint: disable=global-statement
+
+    if len(items) <= 1 or getattr(_parallel_map_local, 'in_pool', False):
+        return [func(item) for item in items]
+
+    with _parallel_map_lock:
+        if _parallel_map_executor is None:
+            _parallel_map_executor = ThreadPoolExecutor(max_workers=PARALLEL_MAP_WORKERS,
+                                                        thread_name_prefix='parallel-map')
+        executor = _parallel_map_executor
+    return list(executor.map(_parallel_map_worker, [func] * len(items), items))